@@ -0,0 +1,88 @@
+"""Optional io_uring batch file reader.
+
+Used by run_logger.load_all_diagrams when running on Linux with the
+`liburing` Python bindings installed (pip install liburing). Everything here
+is best-effort: callers fall back to plain reads if it is unavailable or fails.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+_uring_available: Optional[bool] = None
+
+
+def is_uring_available() -> bool:
+    """Check if the io_uring reader can be used on this platform.
+
+    liburing is imported on the first call, not at module load.
+    """
+    global _uring_available
+    if _uring_available is None:
+        _uring_available = False
+        if sys.platform == "linux":
+            try:
+                import liburing  # type: ignore  # noqa: F401
+                _uring_available = True
+            except ImportError:
+                pass
+    return _uring_available
+
+
+def batch_read_files(paths: List[Path]) -> List[Optional[bytes]]:
+    """Read many small files with a single io_uring submission.
+
+    Args:
+        paths: Files to read.
+
+    Returns:
+        File contents in the same order as paths; None for files that don't exist.
+    """
+    import liburing  # type: ignore
+
+    results: List[Optional[bytes]] = [None] * len(paths)
+    fds: Dict[int, int] = {}
+    try:
+        for i, path in enumerate(paths):
+            try:
+                fds[i] = os.open(path, os.O_RDONLY)
+            except FileNotFoundError:
+                continue
+
+        buffers: Dict[int, bytearray] = {}
+        for i, fd in fds.items():
+            size = os.fstat(fd).st_size
+            if size == 0:
+                results[i] = b""
+            else:
+                buffers[i] = bytearray(size)
+        if not buffers:
+            return results
+
+        ring = liburing.Ring()
+        cqe = liburing.Cqe()
+        liburing.io_uring_queue_init(len(buffers), ring)
+        try:
+            for i, buf in buffers.items():
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_read(sqe, fds[i], buf, 0)
+                liburing.io_uring_sqe_set_data64(sqe, i)
+            liburing.io_uring_submit(ring)
+
+            for _ in range(len(buffers)):
+                liburing.io_uring_wait_cqe(ring, cqe)
+                entry = cqe[0]
+                i = entry.user_data
+                n = liburing.trap_error(entry.res)
+                liburing.io_uring_cqe_seen(ring, entry)
+                results[i] = bytes(buffers[i][:n])
+        finally:
+            liburing.io_uring_queue_exit(ring)
+    finally:
+        for fd in fds.values():
+            os.close(fd)
+
+    return results
@@ -4,11 +4,12 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
-from .llm import LLMClient
-from .proxy import ConversationProxy
-from .run_logger import load_run_metadata, load_ideas, load_diagram, load_concept_map
+from .run_logger import load_run_metadata, load_ideas, load_all_diagrams, load_concept_map
+
+if TYPE_CHECKING:
+    from .proxy import ConversationProxy
 
 
 def format_chunk(chunk: Dict[str, Any], index: int, debug: bool = False) -> str:
@@ -25,35 +26,45 @@ def format_chunk(chunk: Dict[str, Any], index: int, debug: bool = False) -> str:
     Returns:
         Formatted string with idea, diagram block, and optional debug line.
     """
-    lines = [f"Idea {index + 1}:"]
-    lines.append(chunk["idea"])
-    lines.append("")  # Blank line before Diagram block
+    debug_line = _format_debug(chunk) if debug and "_debug" in chunk else ""
+    return f"{_chunk_text(chunk, index)}{debug_line}\n"
+
+
+def _chunk_text(chunk: Dict[str, Any], index: int) -> str:
+    """Return the idea and its diagram block, without debug line or trailing newline."""
+    diagram_block = f"Diagram:\n{chunk['diagram']}" if chunk.get("diagram") else "Diagram: (none)"
+    return f"Idea {index + 1}:\n{chunk['idea']}\n\n{diagram_block}"
 
-    if chunk.get("diagram"):
-        lines.append("Diagram:")
-        lines.append(chunk["diagram"])
-    else:
-        lines.append("Diagram: (none)")
 
-    if debug and "_debug" in chunk:
-        d = chunk["_debug"]
-        hidden = d.get("hidden", False)
+def _format_debug(chunk: Dict[str, Any]) -> str:
+    """Return the validator-decision line for a chunk, prefixed with a newline."""
+    d = chunk["_debug"]
+    if d.get("hidden", False):
         extra = d.get("extra_tokens", ())
-        if hidden:
-            tok = f" (extra tokens: {', '.join(extra)})" if extra else ""
-            reason = d.get("reason", "")
-            if reason:
-                lines.append(f"  [debug] diagram hidden ({reason}){tok}")
-            else:
-                lines.append(f"  [debug] diagram hidden{tok}")
-        else:
-            existed = chunk.get("diagram") is not None
-            if existed:
-                lines.append("  [debug] diagram shown")
-            else:
-                lines.append("  [debug] diagram not generated")
+        tok = f" (extra tokens: {', '.join(extra)})" if extra else ""
+        reason = d.get("reason", "")
+        if reason:
+            return f"\n  [debug] diagram hidden ({reason}){tok}"
+        return f"\n  [debug] diagram hidden{tok}"
+    if chunk.get("diagram") is not None:
+        return "\n  [debug] diagram shown"
+    return "\n  [debug] diagram not generated"
+
 
-    return "\n".join(lines) + "\n"
+def _make_formatter(debug: bool) -> Callable[[Dict[str, Any], int], str]:
+    """Return format_chunk specialized for a fixed debug flag.
+
+    The interactive loop binds this once per session so per-chunk formatting
+    skips the debug checks when debug is off.
+    """
+    if not debug:
+        def _format_plain(chunk: Dict[str, Any], index: int) -> str:
+            return f"{_chunk_text(chunk, index)}\n"
+        return _format_plain
+
+    def _format_debug_on(chunk: Dict[str, Any], index: int) -> str:
+        return format_chunk(chunk, index, debug=True)
+    return _format_debug_on
 
 
 def display_controls(has_next: bool, has_prev: bool = False, is_replay: bool = False) -> str:
@@ -71,6 +82,8 @@ def display_controls(has_next: bool, has_prev: bool = False, is_replay: bool = F
 
 def run_interactive_loop(proxy: ConversationProxy, is_replay: bool = False) -> None:
     """Run the interactive conversation loop."""
+    fmt = _make_formatter(proxy.debug)
+
     while True:
         chunk = proxy.get_current_chunk()
 
@@ -79,8 +92,12 @@ def run_interactive_loop(proxy: ConversationProxy, is_replay: bool = False) -> N
             break
 
         has_prev = proxy.current_index > 0
-        print(f"\n{format_chunk(chunk, proxy.current_index, debug=proxy.debug)}")
-        print(display_controls(proxy.has_next(), has_prev=has_prev, is_replay=is_replay))
+        # Show the idea before asking has_next(): with a streamed EXPLAIN it
+        # waits until the next idea has been parsed.
+        sys.stdout.write(f"\n{fmt(chunk, proxy.current_index)}\n")
+        sys.stdout.flush()
+        sys.stdout.write(f"{display_controls(proxy.has_next(), has_prev=has_prev, is_replay=is_replay)}\n")
+        sys.stdout.flush()
 
         try:
             user_input = input("\n> ").strip().lower()
@@ -113,7 +130,7 @@ def run_interactive_loop(proxy: ConversationProxy, is_replay: bool = False) -> N
 
 def _show_replay_info(proxy: ConversationProxy) -> None:
     """Show run metadata summary in replay mode."""
-    if not hasattr(proxy, 'run_metadata'):
+    if not proxy.supports_replay_info:
         return
     
     meta = proxy.run_metadata
@@ -128,6 +145,19 @@ def _show_replay_info(proxy: ConversationProxy) -> None:
 
 class ReplayProxy:
     """Proxy for replay mode that loads from disk."""
+
+    supports_replay_info = True  # has run_metadata for _show_replay_info
+
+    __slots__ = (
+        "run_path",
+        "no_diagrams",
+        "debug",
+        "run_metadata",
+        "ideas",
+        "current_index",
+        "_diagrams",
+        "concept_map_text",
+    )
     
     def __init__(
         self,
@@ -149,6 +179,9 @@ class ReplayProxy:
         self.run_metadata = load_run_metadata(run_path)
         self.ideas = load_ideas(run_path)
         self.current_index = 0
+
+        # Read every diagram up front: one sequential pass instead of a read per navigation
+        self._diagrams: List[Optional[str]] = load_all_diagrams(run_path, len(self.ideas))
         
         # Load concept map if it exists and run indicates map-first mode
         self.concept_map_text: Optional[str] = None
@@ -173,8 +206,9 @@ class ReplayProxy:
         diagram_existed = False
         hidden_reason: Optional[str] = None
         
+        diagram_text = self._diagrams[self.current_index]
+
         if not self.no_diagrams:
-            diagram_text = load_diagram(self.run_path, self.current_index + 1)
             if diagram_text and diagram_text != "(none)":
                 diagram_existed = True
                 diagram = diagram_text
@@ -182,7 +216,6 @@ class ReplayProxy:
                 diagram_existed = False
         else:
             # Check if diagram exists even if we're hiding it
-            diagram_text = load_diagram(self.run_path, self.current_index + 1)
             if diagram_text and diagram_text != "(none)":
                 diagram_existed = True
                 hidden_reason = "flag_no_diagrams"
@@ -264,6 +297,12 @@ def main() -> None:
         default=Path("./runs"),
         help="Directory for run logs (default: ./runs)",
     )
+    ask_parser.add_argument(
+        "--cache",
+        action="store_true",
+        default=False,
+        help="Reuse cached upstream responses for identical prompts (default: off; replays the first answer)",
+    )
     ask_parser.add_argument(
         "--no-nlp-shadow",
         action="store_true",
@@ -281,6 +320,18 @@ def main() -> None:
         default=False,
         help="Skip per-idea diagram generation (evaluation helper)",
     )
+    ask_parser.add_argument(
+        "--batch-diagrams",
+        action="store_true",
+        default=False,
+        help="Generate all idea diagrams in one upstream call instead of one call per idea",
+    )
+    ask_parser.add_argument(
+        "--single-call",
+        action="store_true",
+        default=False,
+        help="Get ideas and diagrams from one upstream call instead of separate explain/visualize calls",
+    )
     
     # replay command
     replay_parser = subparsers.add_parser("replay", help="Replay a previous run")
@@ -299,8 +350,17 @@ def main() -> None:
     args = parser.parse_args()
 
     if args.command == "ask":
+        # Imported here so `cpp replay` never loads the upstream-LLM modules
+        from .llm import LLMClient, default_cache_dir
+        from .proxy import ConversationProxy
+
+        proxy = None
         try:
-            llm_client = LLMClient(model=args.model, api_key=args.api_key)
+            llm_client = LLMClient(
+                model=args.model,
+                api_key=args.api_key,
+                cache_dir=default_cache_dir() if args.cache else None,
+            )
             proxy = ConversationProxy(
                 llm_client,
                 no_diagrams=args.no_diagrams,
@@ -309,6 +369,8 @@ def main() -> None:
                 nlp_shadow=not args.no_nlp_shadow,
                 map_first=args.map_first,
                 no_idea_diagrams=args.no_idea_diagrams,
+                batch_diagrams=args.batch_diagrams,
+                single_call=args.single_call,
             )
             print(f"Processing: {args.prompt}\n")
             proxy.start_conversation(args.prompt)
@@ -324,6 +386,7 @@ def main() -> None:
                     input()
                 except (EOFError, KeyboardInterrupt):
                     print("\n\nGoodbye!")
+                    proxy.close()
                     sys.exit(0)
                 print()
             
@@ -331,8 +394,12 @@ def main() -> None:
             proxy.finalize_run()
         except KeyboardInterrupt:
             print("\n\nInterrupted. Goodbye!")
+            if proxy is not None:
+                proxy.close()
             sys.exit(0)
         except Exception as e:
+            if proxy is not None:
+                proxy.close()
             print(f"\nError: {e}", file=sys.stderr)
             import traceback
             if args.debug:
@@ -2,21 +2,44 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import os
-from typing import Optional
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+
+def default_cache_dir() -> Path:
+    """Per-user response cache directory ($XDG_CACHE_HOME/cpp/llm, else ~/.cache/cpp/llm)."""
+    base = os.getenv("XDG_CACHE_HOME")
+    root = Path(base) if base else Path.home() / ".cache"
+    return root / "cpp" / "llm"
 
 
 class LLMClient:
-    """Client for making upstream LLM calls."""
+    """Client for making upstream LLM calls.
+
+    Reuse one instance across requests: it holds the OpenAI client, and with
+    it the HTTP connection pool, so back-to-back calls skip new TCP/TLS handshakes.
+    """
 
-    def __init__(self, model: str = "gpt-4o-mini", api_key: Optional[str] = None):
+    def __init__(
+        self,
+        model: str = "gpt-4o-mini",
+        api_key: Optional[str] = None,
+        cache_dir: Optional[Path] = None,
+    ):
         """Initialize the LLM client.
 
         Args:
             model: Model identifier (default: gpt-4o-mini).
             api_key: API key (defaults to OPENAI_API_KEY env var).
+            cache_dir: Optional directory for caching responses by content hash
+                (if None, every call goes upstream).
         """
         self.model = model
+        self.cache_dir = cache_dir
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
 
         if not self.api_key:
@@ -25,10 +48,31 @@ class LLMClient:
                 "or pass api_key parameter."
             )
 
+        self._client: Optional[Any] = None  # openai.OpenAI, built on first use
+
+    @property
+    def client(self) -> Any:
+        """OpenAI client, created once and reused so calls share its connection pool."""
+        if self._client is None:
+            try:
+                from openai import OpenAI
+            except ImportError:
+                raise ImportError("openai package required. Install with: pip install openai")
+
+            self._client = OpenAI(api_key=self.api_key, http_client=_http2_client("DefaultHttpxClient"))
+        return self._client
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The OpenAI client (sockets, locks) can't be pickled or shared across a
+        # fork; drop it and let the client property rebuild it on first use.
+        state = self.__dict__.copy()
+        state["_client"] = None
+        return state
+
     def generate_raw(self, system_prompt: str, user_message: str) -> str:
         """Call upstream LLM with system and user messages, return raw response text.
 
-        Makes exactly one upstream LLM call. No parsing or validation.
+        Makes at most one upstream LLM call (none on a cache hit). No parsing or validation.
 
         Args:
             system_prompt: System message with instructions (template minus user question section).
@@ -37,20 +81,157 @@ class LLMClient:
         Returns:
             Raw response text from the model.
         """
+        return "".join(self.generate_raw_stream(system_prompt, user_message)).strip()
+
+    def _cache_path(self, system_prompt: str, user_message: str) -> Optional[Path]:
+        """Return the cache file for this (model, prompt) pair, or None if caching is off."""
+        if self.cache_dir is None:
+            return None
+        key = hashlib.blake2b(
+            f"{self.model}\x00{system_prompt}\x00{user_message}".encode("utf-8"),
+            digest_size=16,
+        ).hexdigest()
+        # Shard by key prefix so one directory never holds every cached response
+        return self.cache_dir / key[:2] / f"{key}.txt"
+
+    async def agenerate_raw_many(
+        self, requests: List[Tuple[str, str]], concurrency: int = 8
+    ) -> List[Union[str, BaseException]]:
+        """Make one upstream call per (system_prompt, user_message) pair concurrently.
+
+        Uses AsyncOpenAI with at most `concurrency` requests in flight. The async
+        client is scoped to this call so it never outlives the event loop.
+
+        Args:
+            requests: (system_prompt, user_message) pairs.
+            concurrency: Max simultaneous upstream calls.
+
+        Returns:
+            Raw response text per request, in order; a failed call's exception
+            is returned in its slot instead of raising.
+        """
         try:
-            from openai import OpenAI
+            from openai import AsyncOpenAI
         except ImportError:
             raise ImportError("openai package required. Install with: pip install openai")
 
-        client = OpenAI(api_key=self.api_key)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async with AsyncOpenAI(
+            api_key=self.api_key, http_client=_http2_client("DefaultAsyncHttpxClient")
+        ) as client:
+
+            async def one(system_prompt: str, user_message: str) -> str:
+                cache_path = self._cache_path(system_prompt, user_message)
+                cached = _read_cache(cache_path)
+                if cached is not None:
+                    return cached
+
+                async with semaphore:
+                    response = await client.chat.completions.create(
+                        model=self.model,
+                        messages=_messages(system_prompt, user_message),
+                        temperature=0.7,
+                    )
+                text = (response.choices[0].message.content or "").strip()
+
+                _write_cache(cache_path, text)
+                return text
+
+            return await asyncio.gather(
+                *(one(system_prompt, user_message) for system_prompt, user_message in requests),
+                return_exceptions=True,
+            )
 
-        response = client.chat.completions.create(
+    def generate_raw_many(
+        self, requests: List[Tuple[str, str]], concurrency: int = 8
+    ) -> List[Union[str, BaseException]]:
+        """Sync wrapper around agenerate_raw_many; must not be called from a running event loop."""
+        return asyncio.run(self.agenerate_raw_many(requests, concurrency))
+
+    def generate_raw_stream(self, system_prompt: str, user_message: str) -> Iterator[str]:
+        """Call upstream LLM with streaming enabled, yielding response text as it arrives.
+
+        Makes at most one upstream LLM call. Yielded pieces are unstripped deltas;
+        joining them gives the full response. A cache hit yields the stored
+        response as a single piece; a fully consumed stream is written to the cache.
+
+        Args:
+            system_prompt: System message with instructions.
+            user_message: User message with the actual question.
+
+        Yields:
+            Response text deltas in arrival order.
+        """
+        cache_path = self._cache_path(system_prompt, user_message)
+        cached = _read_cache(cache_path)
+        if cached is not None:
+            yield cached
+            return
+
+        stream = self.client.chat.completions.create(
             model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message},
-            ],
+            messages=_messages(system_prompt, user_message),
             temperature=0.7,
+            stream=True,
         )
 
-        return (response.choices[0].message.content or "").strip()
+        pieces: List[str] = []
+        for chunk in stream:
+            if chunk.choices:
+                piece = chunk.choices[0].delta.content or ""
+                pieces.append(piece)
+                yield piece
+
+        _write_cache(cache_path, "".join(pieces).strip())
+
+
+def _http2_client(factory: str) -> Any:
+    """HTTP/2 client from the openai SDK's default client factory, or None.
+
+    HTTP/2 lets concurrent calls share one multiplexed connection. None (the SDK's
+    default HTTP/1.1 pool) if the SDK predates the factory or h2 isn't installed.
+    """
+    try:
+        import openai
+        return getattr(openai, factory)(http2=True)
+    except (ImportError, AttributeError):
+        return None
+
+
+def _messages(system_prompt: str, user_message: str) -> List[Dict[str, str]]:
+    """Chat messages for one upstream call."""
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_message},
+    ]
+
+
+def _read_cache(path: Optional[Path]) -> Optional[str]:
+    """Return cached response text, or None on a miss (or if caching is off)."""
+    if path is None or not path.is_file():
+        return None
+    return path.read_text(encoding="utf-8")
+
+
+def _write_cache(path: Optional[Path], text: str) -> None:
+    """Store a response in the cache, best-effort: an unwritable cache never fails the call."""
+    if path is None:
+        return
+    try:
+        _write_atomic(path, text)
+    except OSError:
+        pass
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Write text to path via a temp file + rename so readers never see partial output."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
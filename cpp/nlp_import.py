@@ -1,7 +1,8 @@
 """Guarded import helper for nlp_diagrammer.
 
 This module provides a safe way to import nlp_diagrammer, which is a sibling
-package in the workspace. It handles import errors gracefully.
+package in the workspace. It handles import errors gracefully, and defers the
+import (and any sys.path change) until the functions are first needed.
 """
 
 from __future__ import annotations
@@ -14,43 +15,63 @@ if TYPE_CHECKING:
     from nlp_diagrammer.nlp_diagrammer.heuristics import analyze_sentence  # type: ignore
     from nlp_diagrammer.nlp_diagrammer.diagrammer import render_diagram  # type: ignore
 
-# Try to import nlp_diagrammer
-_nlp_available = False
+# Resolved on first use (see _load); importing this module has no side effects.
+_nlp_available: Optional[bool] = None
 _import_error: Optional[Exception] = None
-analyze_sentence = None
-render_diagram = None
-
-try:
-    # First try direct import (works if installed or in workspace)
-    import nlp_diagrammer
-    from nlp_diagrammer.nlp_diagrammer.heuristics import analyze_sentence
-    from nlp_diagrammer.nlp_diagrammer.diagrammer import render_diagram
-    _nlp_available = True
-except ImportError as e1:
-    # Fallback: add repo root to sys.path (so nlp_diagrammer package can be found)
+_functions = (None, None)
+
+
+def _load() -> bool:
+    """Import nlp_diagrammer once and cache the result."""
+    global _nlp_available, _import_error, _functions
+    if _nlp_available is not None:
+        return _nlp_available
+
+    _nlp_available = False
     try:
-        # cpp/nlp_import.py -> cpp -> repo root
-        base = Path(__file__).resolve().parent.parent
-        nlp_path = base / "nlp_diagrammer"
-        if nlp_path.exists() and nlp_path.is_dir():
-            # Add repo root to sys.path so "import nlp_diagrammer" works
-            if str(base) not in sys.path:
-                sys.path.insert(0, str(base))
-            import nlp_diagrammer
-            from nlp_diagrammer.nlp_diagrammer.heuristics import analyze_sentence
-            from nlp_diagrammer.nlp_diagrammer.diagrammer import render_diagram
-            _nlp_available = True
-    except Exception as e2:
-        _import_error = e2
+        # First try direct import (works if installed or in workspace)
+        import nlp_diagrammer
+        from nlp_diagrammer.nlp_diagrammer.heuristics import analyze_sentence
+        from nlp_diagrammer.nlp_diagrammer.diagrammer import render_diagram
+        _functions = (analyze_sentence, render_diagram)
+        _nlp_available = True
+    except ImportError as e1:
+        # Fallback: add repo root to sys.path (so nlp_diagrammer package can be found)
+        try:
+            # cpp/nlp_import.py -> cpp -> repo root
+            base = Path(__file__).resolve().parent.parent
+            nlp_path = base / "nlp_diagrammer"
+            if nlp_path.exists() and nlp_path.is_dir():
+                # Add repo root to sys.path so "import nlp_diagrammer" works
+                if str(base) not in sys.path:
+                    sys.path.insert(0, str(base))
+                import nlp_diagrammer
+                from nlp_diagrammer.nlp_diagrammer.heuristics import analyze_sentence
+                from nlp_diagrammer.nlp_diagrammer.diagrammer import render_diagram
+                _functions = (analyze_sentence, render_diagram)
+                _nlp_available = True
+        except Exception as e2:
+            _import_error = e2
+    return _nlp_available
+
+
+def __getattr__(name: str):
+    """Resolve analyze_sentence / render_diagram lazily (PEP 562)."""
+    if name == "analyze_sentence":
+        _load()
+        return _functions[0]
+    if name == "render_diagram":
+        _load()
+        return _functions[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def is_nlp_available() -> bool:
     """Check if nlp_diagrammer is available for import."""
-    return _nlp_available
+    return _load()
 
 
 def get_nlp_functions():
     """Get nlp_diagrammer functions if available, otherwise return None."""
-    if _nlp_available:
-        return analyze_sentence, render_diagram
-    return None, None
+    _load()
+    return _functions
@@ -4,7 +4,26 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Compiled once; these run on every upstream response.
+# "Idea <n>:" must sit on one line (spaces/tabs only between "Idea" and n), in
+# every parser; a head split across a line break is idea text.
+_IDEA_MARKER_RE = re.compile(r'^Idea[ \t]+\d+:', re.MULTILINE)
+_IDEA_HEAD_RE = re.compile(r'^Idea[ \t]+(\d+):\s*(.*)', re.DOTALL)
+_DIAGRAM_MARKER_RE = re.compile(r'^Diagram\s+\d+:', re.MULTILINE)
+_DIAGRAM_HEAD_RE = re.compile(r'^Diagram\s+(\d+):\s*(.*)', re.DOTALL)
+_DIAGRAM_RE = re.compile(r'Diagram:\s*', re.IGNORECASE)
+_IDEA_LINE_RE = re.compile(r'Idea[ \t]+(\d+):')
+_LINE_DIAGRAM_RE = re.compile(r'(?:^|(?<= ))Diagram:', re.IGNORECASE)
+_MAP_RE = re.compile(r'Map:\s*', re.IGNORECASE)
+_NONE_RE = re.compile(r'^\(none\)\s*$', re.IGNORECASE)
+
+# parse_chunks states
+_EXPECT_IDEA = 0
+_IN_IDEA_TEXT = 1
+_IN_DIAGRAM = 2
+_DONE_BLOCK = 3
 
 
 @dataclass
@@ -30,24 +49,84 @@ def parse_ideas_only(raw: str) -> List[str]:
     """
     ideas: List[str] = []
     # Split by "Idea <n>:" markers (n = 1, 2, ...)
-    blocks = re.split(r'(?=^Idea\s+\d+:)', raw.strip(), flags=re.MULTILINE)
+    blocks = _split_on_prefix(raw.strip(), _IDEA_MARKER_RE)
     
     for block in blocks:
-        block = block.strip()
-        if not block:
-            continue
-        
-        match = re.match(r'^Idea\s+\d+:\s*(.*)', block, re.DOTALL)
-        if not match:
-            continue
-        
-        idea_text = match.group(1).strip()
+        idea_text = _idea_block_text(block)
         if idea_text:
             ideas.append(idea_text)
     
     return ideas
 
 
+def iter_ideas_stream(deltas: Iterable[str]) -> Iterator[str]:
+    """Incrementally parse a streamed ideas-only response.
+    
+    Yields each idea as soon as its block is complete, i.e. when the next
+    "Idea <n>:" marker arrives (or the stream ends). The yielded ideas are
+    exactly parse_ideas_only("".join(deltas)).
+    
+    Args:
+        deltas: Response text pieces in arrival order.
+        
+    Yields:
+        Idea text strings (no "Idea n:" prefix).
+    """
+    buf = ""
+    started = False
+    block_start = 0
+    
+    for delta in deltas:
+        buf += delta
+        if not started:
+            # Mirror raw.strip(): the first block starts at the first non-space char
+            buf = buf.lstrip()
+            if not buf:
+                continue
+            started = True
+        
+        # Every block before the latest marker is complete
+        while True:
+            marker = _IDEA_MARKER_RE.search(buf, block_start + 1)
+            if marker is None:
+                break
+            idea_text = _idea_block_text(buf[block_start:marker.start()])
+            if idea_text:
+                yield idea_text
+            block_start = marker.start()
+    
+    if started:
+        idea_text = _idea_block_text(buf[block_start:])
+        if idea_text:
+            yield idea_text
+
+
+def _split_on_prefix(text: str, prefix_re: re.Pattern) -> Iterator[str]:
+    """Split text before each prefix_re match (the leading text is yielded first).
+    
+    Same pieces as re.split on a zero-width lookahead, from one finditer scan.
+    """
+    prev = 0
+    for match in prefix_re.finditer(text):
+        start = match.start()
+        yield text[prev:start]
+        prev = start
+    yield text[prev:]
+
+
+def _idea_block_text(block: str) -> str:
+    """Return the idea text of one "Idea <n>: ..." block, or "" if it isn't one."""
+    block = block.strip()
+    if not block:
+        return ""
+    
+    match = _IDEA_HEAD_RE.match(block)
+    if not match:
+        return ""
+    
+    return match.group(2).strip()
+
+
 def parse_diagram_only(raw: str) -> Optional[List[str]]:
     """Parse diagram-only response into list of diagram lines.
     
@@ -62,13 +141,13 @@ def parse_diagram_only(raw: str) -> Optional[List[str]]:
         List of diagram lines, or None if "(none)" or empty.
     """
     # Find "Diagram:" marker
-    diagram_match = re.search(r'Diagram:\s*', raw, re.IGNORECASE)
-    if not diagram_match:
+    start = _marker_end(raw, "Diagram:", _DIAGRAM_RE)
+    if start < 0:
         return None
     
-    diagram_part = raw[diagram_match.end():].strip()
+    diagram_part = raw[start:].strip()
     
-    if not diagram_part or re.match(r'^\(none\)\s*$', diagram_part, re.IGNORECASE):
+    if not diagram_part or _NONE_RE.match(diagram_part):
         return None
     
     # Diagram runs until blank line (or end)
@@ -82,6 +161,65 @@ def parse_diagram_only(raw: str) -> Optional[List[str]]:
     return lines if lines else None
 
 
+def _marker_end(raw: str, marker: str, pattern: re.Pattern) -> int:
+    """Return the index just past the first case-insensitive marker match, or -1.
+    
+    Fast path: the literal marker with no ':' before it must be the first match
+    (any earlier match would end in a ':'). Otherwise fall back to pattern.
+    """
+    idx = raw.find(marker)
+    if idx >= 0 and ':' not in raw[:idx]:
+        return idx + len(marker)
+    match = pattern.search(raw)
+    return match.end() if match else -1
+
+
+def parse_diagrams_batch(raw: str) -> Dict[int, Optional[List[str]]]:
+    """Parse batch visualizer response into per-idea diagram lines.
+    
+    Format per item:
+        Diagram <n>:
+        <lines until blank> or (none)
+    
+    Args:
+        raw: Raw LLM response text.
+        
+    Returns:
+        Dict of 1-based idea number -> diagram lines, or None for "(none)"/empty.
+        Ideas with no "Diagram <n>:" block are absent from the dict.
+    """
+    diagrams: Dict[int, Optional[List[str]]] = {}
+    # Split by "Diagram <n>:" markers (n = 1, 2, ...)
+    blocks = _split_on_prefix(raw.strip(), _DIAGRAM_MARKER_RE)
+    
+    for block in blocks:
+        block = block.strip()
+        if not block:
+            continue
+        
+        match = _DIAGRAM_HEAD_RE.match(block)
+        if not match:
+            continue
+        
+        n = int(match.group(1))
+        diagram_part = match.group(2).strip()
+        
+        if not diagram_part or _NONE_RE.match(diagram_part):
+            diagrams[n] = None
+            continue
+        
+        # Diagram runs until blank line (or end)
+        lines = []
+        for line in diagram_part.split('\n'):
+            stripped = line.strip()
+            if not stripped:
+                break
+            lines.append(stripped)
+        diagrams[n] = lines if lines else None
+    
+    return diagrams
+
+
 def parse_map_only(raw: str) -> Optional[str]:
     """Parse map-only response into map text string.
     
@@ -96,13 +234,13 @@ def parse_map_only(raw: str) -> Optional[str]:
         Map text as string, or None if "(none)" or empty.
     """
     # Find "Map:" marker
-    map_match = re.search(r'Map:\s*', raw, re.IGNORECASE)
-    if not map_match:
+    start = _marker_end(raw, "Map:", _MAP_RE)
+    if start < 0:
         return None
     
-    map_part = raw[map_match.end():].strip()
+    map_part = raw[start:].strip()
     
-    if not map_part or re.match(r'^\(none\)\s*$', map_part, re.IGNORECASE):
+    if not map_part or _NONE_RE.match(map_part):
         return None
     
     # Map runs until blank line (or end)
@@ -126,6 +264,9 @@ def parse_chunks(raw: str) -> List[Chunk]:
     "Diagram: (none)" or no Diagram block => diagram_lines is None.
     Diagram may be multi-line up to a blank line.
 
+    Single forward pass over the lines, driven by a small state machine
+    (_EXPECT_IDEA -> _IN_IDEA_TEXT -> _IN_DIAGRAM -> _DONE_BLOCK).
+
     Args:
         raw: Raw LLM response text.
 
@@ -133,42 +274,72 @@ def parse_chunks(raw: str) -> List[Chunk]:
         List of Chunk with index, idea_text, diagram_lines (or None).
     """
     chunks: List[Chunk] = []
-    # Split by "Idea <n>:" markers (n = 1, 2, ...)
-    blocks = re.split(r'(?=^Idea\s+\d+:)', raw.strip(), flags=re.MULTILINE)
+    state = _EXPECT_IDEA
+    n = 0
+    idea_lines: List[str] = []
+    rest_started = False  # idea text has reached its first non-blank char
+    diagram_lines: List[str] = []
+    diagram_tail = False  # non-blank text after the diagram's closing blank line
 
-    for block in blocks:
-        block = block.strip()
-        if not block:
-            continue
-
-        match = re.match(r'^Idea\s+(\d+):\s*(.*)', block, re.DOTALL)
-        if not match:
-            continue
+    for line in raw.strip().split('\n'):
+        head = _IDEA_LINE_RE.match(line) if line.startswith('Idea') else None
+        if head:
+            if state != _EXPECT_IDEA:
+                chunks.append(_finish_chunk(n, idea_lines, state, diagram_lines, diagram_tail))
+            state = _IN_IDEA_TEXT
+            n = int(head.group(1))
+            idea_lines = []
+            rest_started = False
+            diagram_lines = []
+            diagram_tail = False
+            line = line[head.end():]
 
-        n = int(match.group(1))
-        rest = match.group(2).strip()
-
-        # Find "Diagram:" (newline or space before it) and split idea vs diagram
-        diagram_match = re.search(r'(?:\n| )Diagram:\s*', rest, re.IGNORECASE)
-        if not diagram_match:
-            idea_text = rest.strip()
-            diagram_lines = None
-        else:
-            idea_text = rest[: diagram_match.start()].strip()
-            diagram_part = rest[diagram_match.end() :].strip()
-
-            if not diagram_part or re.match(r'^\(none\)\s*$', diagram_part, re.IGNORECASE):
-                diagram_lines = None
+        if state == _IN_IDEA_TEXT:
+            # "Diagram:" counts after a space, or at the start of any line but the first
+            marker = None
+            if rest_started:
+                if ':' in line:
+                    marker = _LINE_DIAGRAM_RE.search(line)
             else:
-                # Diagram runs until blank line (or end)
-                lines = []
-                for line in diagram_part.split('\n'):
-                    stripped = line.strip()
-                    if not stripped:
-                        break
-                    lines.append(stripped)
-                diagram_lines = lines if lines else None
+                stripped = line.lstrip()
+                if stripped:
+                    rest_started = True
+                    if ':' in stripped:
+                        marker = _LINE_DIAGRAM_RE.search(line, len(line) - len(stripped) + 1)
+            if marker is None:
+                idea_lines.append(line)
+                continue
+            idea_lines.append(line[:marker.start()])
+            state = _IN_DIAGRAM
+            line = line[marker.end():]
+
+        if state == _IN_DIAGRAM:
+            stripped = line.strip()
+            if stripped:
+                diagram_lines.append(stripped)
+            elif diagram_lines:
+                state = _DONE_BLOCK
+        elif state == _DONE_BLOCK and not diagram_tail and line.strip():
+            diagram_tail = True
 
-        chunks.append(Chunk(index=n, idea_text=idea_text, diagram_lines=diagram_lines))
+    if state != _EXPECT_IDEA:
+        chunks.append(_finish_chunk(n, idea_lines, state, diagram_lines, diagram_tail))
 
     return chunks
+
+
+def _finish_chunk(
+    n: int,
+    idea_lines: List[str],
+    state: int,
+    diagram_lines: List[str],
+    diagram_tail: bool,
+) -> Chunk:
+    """Build the Chunk for one parsed "Idea <n>:" block."""
+    idea_text = "\n".join(idea_lines).strip()
+    if state == _IN_IDEA_TEXT or not diagram_lines:
+        return Chunk(index=n, idea_text=idea_text, diagram_lines=None)
+    # A lone "(none)" means no diagram
+    if len(diagram_lines) == 1 and not diagram_tail and _NONE_RE.match(diagram_lines[0]):
+        return Chunk(index=n, idea_text=idea_text, diagram_lines=None)
+    return Chunk(index=n, idea_text=idea_text, diagram_lines=diagram_lines)
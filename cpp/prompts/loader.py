@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import hashlib
 from pathlib import Path
 from typing import Optional, Tuple
@@ -10,6 +11,8 @@ from typing import Optional, Tuple
 def load_prompt_text(relative_path: str) -> str:
     """Load prompt text from package or repo root.
     
+    Templates are read once per process and cached; see clear_prompt_cache().
+    
     Args:
         relative_path: Relative path like "prompts/explainer_v1.md"
         
@@ -19,6 +22,23 @@ def load_prompt_text(relative_path: str) -> str:
     Raises:
         FileNotFoundError: If prompt cannot be found.
     """
+    return _load_cached(relative_path)
+
+
+def clear_prompt_cache() -> None:
+    """Drop cached prompt templates so the next load re-reads from disk."""
+    _load_cached.cache_clear()
+    _template_parts.cache_clear()
+
+
+@functools.lru_cache(maxsize=32)
+def _template_parts(relative_path: str, placeholder: str) -> Tuple[str, ...]:
+    """Template split once at placeholder; join the parts with the value to substitute."""
+    return tuple(load_prompt_text(relative_path).split(placeholder))
+
+
+@functools.lru_cache(maxsize=32)
+def _load_cached(relative_path: str) -> str:
     # Try package first (when installed)
     try:
         import importlib.resources as res
@@ -45,9 +65,12 @@ def load_prompt_text(relative_path: str) -> str:
     )
 
 
+@functools.lru_cache(maxsize=64)
 def sha256(text: str) -> str:
     """Compute SHA256 hash of text as hex string.
     
+    Memoized: the same prompt templates are hashed for every run.json.
+    
     Args:
         text: Input text.
         
@@ -127,16 +150,32 @@ def load_visualizer_prompt(idea_text: str) -> Tuple[str, str]:
     Returns:
         Tuple of (system_prompt, user_message).
     """
-    template = load_prompt_text("prompts/visualizer_v1.md")
-    
-    # Replace {{IDEA_TEXT}} placeholder
-    system_prompt = template.replace("{{IDEA_TEXT}}", idea_text)
+    # Replace {{IDEA_TEXT}} placeholder (template pre-split once per process)
+    system_prompt = idea_text.join(_template_parts("prompts/visualizer_v1.md", "{{IDEA_TEXT}}"))
     
     # The template is designed to be a single system message
     # Return as system prompt with empty user message
     return (system_prompt.strip(), "")
 
 
+def load_batch_visualizer_prompt(ideas: list[str]) -> Tuple[str, str]:
+    """Load batch visualizer prompt template and substitute the numbered ideas.
+    
+    One call covers every idea; the model answers with "Diagram <n>:" blocks
+    (see parser.parse_diagrams_batch).
+    
+    Args:
+        ideas: List of idea strings (no "Idea n:" prefix).
+        
+    Returns:
+        Tuple of (system_prompt, user_message).
+    """
+    ideas_list = "\n".join(f"Idea {i + 1}: {idea}" for i, idea in enumerate(ideas))
+    system_prompt = ideas_list.join(_template_parts("prompts/visualizer_batch_v1.md", "{{IDEAS_LIST}}"))
+    
+    return (system_prompt.strip(), "")
+
+
 def load_map_visualizer_prompt(ideas: list[str]) -> Tuple[str, str]:
     """Load map visualizer prompt template and substitute ideas list.
     
@@ -146,13 +185,11 @@ def load_map_visualizer_prompt(ideas: list[str]) -> Tuple[str, str]:
     Returns:
         Tuple of (system_prompt, user_message).
     """
-    template = load_prompt_text("prompts/map_visualizer_v1.md")
-    
     # Format ideas as numbered list
     ideas_list = "\n".join(ideas)
     
     # Replace {{IDEAS_LIST}} placeholder
-    system_prompt = template.replace("{{IDEAS_LIST}}", ideas_list)
+    system_prompt = ideas_list.join(_template_parts("prompts/map_visualizer_v1.md", "{{IDEAS_LIST}}"))
     
     # The template is designed to be a single system message
     # Return as system prompt with empty user message
@@ -2,22 +2,92 @@
 
 from __future__ import annotations
 
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 
 from .diagram_validator import (
     DiagramValidationResult,
-    validate_diagram,
+    idea_allowed_tokens,
+    validate_diagram_text,
     should_hide_diagram,
 )
 from .llm import LLMClient
-from .parser import parse_ideas_only, parse_diagram_only, parse_map_only
-from .prompts.loader import load_explainer_prompt, load_visualizer_prompt, load_map_visualizer_prompt
+from .nlp_import import get_nlp_functions
+from .parser import (
+    iter_ideas_stream,
+    parse_chunks,
+    parse_diagram_only,
+    parse_diagrams_batch,
+    parse_map_only,
+)
+from .prompts.loader import (
+    load_batch_visualizer_prompt,
+    load_explainer_prompt,
+    load_map_visualizer_prompt,
+    load_upstream_prompt,
+    load_visualizer_prompt,
+)
+from .run_logger import (
+    create_run_dir,
+    save_concept_map,
+    save_diagram,
+    save_explain_output,
+    save_ideas,
+    save_nlp_diagram,
+    save_run_arrow,
+    save_run_metadata,
+)
+
+
+_NO_METADATA: Dict[str, Any] = {}  # read-only default for ideas with no diagram yet
+
+_VISUALIZER_PROMPT_FILE = "prompts/visualizer_v1.md"
+_BATCH_VISUALIZER_PROMPT_FILE = "prompts/visualizer_batch_v1.md"
 
 
 class ConversationProxy:
     """Proxy that controls conversational pacing."""
 
+    supports_replay_info = False  # no run_metadata until the run is finalized
+
+    __slots__ = (
+        "llm_client",
+        "no_diagrams",
+        "debug",
+        "log_dir",
+        "nlp_shadow",
+        "_nlp_functions",
+        "map_first",
+        "no_idea_diagrams",
+        "batch_diagrams",
+        "single_call",
+        "user_prompt",
+        "ideas",
+        "_idea_allowed",
+        "diagram_cache",
+        "diagram_metadata",
+        "current_index",
+        "explainer_model",
+        "visualizer_model",
+        "map_visualizer_model",
+        "explain_raw",
+        "concept_map_text",
+        "run_path",
+        "_created_at",
+        "_ideas_cond",
+        "_ideas_done",
+        "_ideas_error",
+        "_ideas_error_reported",
+        "_diagram_pool",
+        "_diagram_futures",
+        "_visualize_calls",
+        "_closed",
+    )
+
     def __init__(
         self,
         llm_client: LLMClient,
@@ -28,6 +98,8 @@ class ConversationProxy:
         nlp_shadow: bool = True,
         map_first: bool = False,
         no_idea_diagrams: bool = False,
+        batch_diagrams: bool = False,
+        single_call: bool = False,
     ):
         """Initialize the proxy.
 
@@ -39,16 +111,25 @@ class ConversationProxy:
             nlp_shadow: If True, enable shadow NLP diagram logging (default: True).
             map_first: If True, generate concept map before showing ideas.
             no_idea_diagrams: If True, skip per-idea diagram generation.
+            batch_diagrams: If True, request all idea diagrams in one VISUALIZE call
+                up front; ideas missing from the batch response fall back to per-idea calls.
+            single_call: If True, get ideas and their diagrams from one upstream call
+                (upstream_prompt_template.md) instead of EXPLAIN + VISUALIZE calls.
         """
         self.llm_client = llm_client
         self.no_diagrams = no_diagrams
         self.debug = debug
         self.log_dir = log_dir
         self.nlp_shadow = nlp_shadow
+        # (analyze_sentence, render_diagram), resolved by finalize_run on first use
+        self._nlp_functions: Optional[Tuple[Optional[Callable], Optional[Callable]]] = None
         self.map_first = map_first
         self.no_idea_diagrams = no_idea_diagrams
+        self.batch_diagrams = batch_diagrams
+        self.single_call = single_call
         self.user_prompt: Optional[str] = None
         self.ideas: List[str] = []
+        self._idea_allowed: List[FrozenSet[str]] = []  # per-idea validator token sets
         self.diagram_cache: Dict[int, Optional[str]] = {}  # index -> diagram or None
         self.diagram_metadata: Dict[int, Dict[str, Any]] = {}  # index -> metadata
         self.current_index: int = 0
@@ -58,11 +139,24 @@ class ConversationProxy:
         self.explain_raw: Optional[str] = None
         self.concept_map_text: Optional[str] = None
         self.run_path: Optional[Path] = None
+        self._created_at: Optional[datetime] = None
+        self._ideas_cond = threading.Condition()
+        self._ideas_done: bool = True  # False while the EXPLAIN stream is still arriving
+        self._ideas_error: Optional[BaseException] = None
+        self._ideas_error_reported: bool = False
+        self._diagram_pool: Optional[ThreadPoolExecutor] = None  # eager VISUALIZE calls
+        self._diagram_futures: Dict[int, Future] = {}  # index -> in-flight VISUALIZE call
+        self._visualize_calls: Dict[str, Future] = {}  # idea text -> its (shared) call
+        self._closed: bool = False  # set by close(); no new VISUALIZE calls after it
 
     def start_conversation(self, user_prompt: str) -> None:
         """Start a new conversation with the user prompt.
 
         Makes EXPLAIN call to get ideas only, then initializes for eager diagram generation.
+        The EXPLAIN response is streamed on a background thread; this returns as soon
+        as the first idea is parsed (or all ideas, if map_first/batch_diagrams need them).
+        Each idea's VISUALIZE call starts as soon as the idea is parsed, concurrently
+        with the others (see _schedule_diagram).
 
         Args:
             user_prompt: The user's question or prompt.
@@ -71,22 +165,36 @@ class ConversationProxy:
         self.current_index = 0
         self.diagram_cache = {}
         self.diagram_metadata = {}
+        self._diagram_futures = {}
+        self._visualize_calls = {}
+        self._created_at = datetime.now()
 
         # Create run directory if logging enabled
         if self.log_dir:
-            from .run_logger import create_run_dir
-            self.run_path = create_run_dir(self.log_dir, user_prompt)
+            self.run_path = create_run_dir(self.log_dir, user_prompt, self._created_at)
 
-        # EXPLAIN call: ideas only
-        system_prompt, user_message = load_explainer_prompt(user_prompt)
-        self.explain_raw = self.llm_client.generate_raw(system_prompt, user_message)
-        self.ideas = parse_ideas_only(self.explain_raw)
+        self.explain_raw = None
+        self.ideas = []
+        self._idea_allowed = []
+        self._ideas_error = None
+        self._ideas_error_reported = False
 
-        # Save explain output if logging
-        if self.run_path and self.explain_raw:
-            from .run_logger import save_explain_output, save_ideas
-            save_explain_output(self.run_path, self.explain_raw)
-            save_ideas(self.run_path, self.ideas)
+        if self.single_call:
+            self._explain_and_visualize(user_prompt)
+        else:
+            # EXPLAIN call: ideas only, parsed as the response streams in
+            system_prompt, user_message = load_explainer_prompt(user_prompt)
+            self._ideas_done = False
+            threading.Thread(
+                target=self._consume_explain_stream,
+                args=(system_prompt, user_message),
+                daemon=True,
+            ).start()
+
+            if self.map_first or self.batch_diagrams:
+                self._wait_for_ideas()
+            else:
+                self._wait_for_ideas(1)
 
         # Generate concept map if map_first mode
         if self.map_first and self.ideas:
@@ -98,9 +206,197 @@ class ConversationProxy:
             
             # Save concept map if logging
             if self.run_path:
-                from .run_logger import save_concept_map
                 save_concept_map(self.run_path, self.concept_map_text)
 
+        if self.batch_diagrams and not self.single_call and self.ideas and self._visualize_enabled():
+            self._generate_diagrams_batch()
+
+    def _explain_and_visualize(self, user_prompt: str) -> None:
+        """Get ideas and their diagrams from one upstream call (single_call mode).
+
+        The response uses the "Idea <n>: / Diagram:" format parsed by parse_chunks;
+        each diagram is validated and cached just like a VISUALIZE result.
+
+        Args:
+            user_prompt: The user's question or prompt.
+        """
+        system_prompt, user_message = load_upstream_prompt(user_prompt)
+        self.explain_raw = self.llm_client.generate_raw(system_prompt, user_message)
+        chunks = [chunk for chunk in parse_chunks(self.explain_raw) if chunk.idea_text]
+        self.ideas = [chunk.idea_text for chunk in chunks]
+        self._idea_allowed = [idea_allowed_tokens(idea) for idea in self.ideas]
+        self._ideas_done = True
+
+        # Save explain output if logging
+        if self.run_path and self.explain_raw:
+            save_explain_output(self.run_path, self.explain_raw)
+            save_ideas(self.run_path, self.ideas)
+
+        if not self.no_idea_diagrams:
+            for idea_index, chunk in enumerate(chunks):
+                self._store_diagram(idea_index, chunk.diagram_lines)
+
+    def _consume_explain_stream(self, system_prompt: str, user_message: str) -> None:
+        """Stream the EXPLAIN response, publishing each idea as its block completes.
+
+        Runs on a background thread started by start_conversation. Saves the
+        explain output and ideas once the stream ends; if it fails after some
+        ideas arrived, saves the partial output and the ideas received so far.
+
+        Args:
+            system_prompt: Explainer system message.
+            user_message: User message with the actual question.
+        """
+        pieces: List[str] = []
+
+        def deltas():
+            for piece in self.llm_client.generate_raw_stream(system_prompt, user_message):
+                pieces.append(piece)
+                yield piece
+
+        eager = not self.batch_diagrams and self._visualize_enabled()
+        try:
+            for idea in iter_ideas_stream(deltas()):
+                allowed = idea_allowed_tokens(idea)
+                with self._ideas_cond:
+                    self.ideas.append(idea)
+                    self._idea_allowed.append(allowed)
+                    if eager:
+                        # Registered before waiters wake, so none of them repeats the call
+                        self._schedule_diagram(len(self.ideas) - 1)
+                    self._ideas_cond.notify_all()
+        except BaseException as e:
+            self._ideas_error = e
+        try:
+            self.explain_raw = "".join(pieces).strip()
+
+            # Save explain output if logging (partial if the stream failed mid-way)
+            if self.run_path and self.explain_raw and (self._ideas_error is None or self.ideas):
+                save_explain_output(self.run_path, self.explain_raw)
+                save_ideas(self.run_path, self.ideas)
+        except BaseException as e:
+            if self._ideas_error is None:
+                self._ideas_error = e
+        finally:
+            with self._ideas_cond:
+                self._ideas_done = True
+                self._ideas_cond.notify_all()
+
+    def _wait_for_ideas(self, count: Optional[int] = None) -> None:
+        """Block until at least count ideas are parsed, or the EXPLAIN stream ends.
+
+        If the EXPLAIN stream failed after some ideas arrived, the error is
+        reported once on stderr and the run continues with those ideas.
+
+        Args:
+            count: Number of ideas needed; None waits for the whole stream.
+
+        Raises:
+            Whatever the EXPLAIN call raised, if it failed before any idea arrived.
+        """
+        with self._ideas_cond:
+            self._ideas_cond.wait_for(
+                lambda: self._ideas_done or (count is not None and len(self.ideas) >= count)
+            )
+            if self._ideas_done and self._ideas_error is not None:
+                if not self.ideas:
+                    raise self._ideas_error
+                if not self._ideas_error_reported and (count is None or len(self.ideas) < count):
+                    self._ideas_error_reported = True
+                    print(
+                        f"\nWarning: response ended early ({self._ideas_error}); "
+                        f"only {len(self.ideas)} idea(s) received.",
+                        file=sys.stderr,
+                    )
+
+    def _visualize_enabled(self) -> bool:
+        """False if VISUALIZE calls are pointless: skipped (--no-idea-diagrams) or
+        their output would always be hidden (--no-diagrams)."""
+        return not (self.no_idea_diagrams or self.no_diagrams)
+
+    def _schedule_diagram(self, idea_index: int) -> None:
+        """Start the VISUALIZE call for one idea on the diagram thread pool.
+
+        At most 8 calls are in flight at once; _generate_diagram waits on the
+        pending call instead of repeating it.
+        Ideas with identical text share one call.
+
+        Args:
+            idea_index: 0-based index of the idea.
+        """
+        if self._closed:
+            return
+        idea_text = self.ideas[idea_index]
+        call = self._visualize_calls.get(idea_text)
+        if call is None:
+            if self._diagram_pool is None:
+                self._diagram_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="cpp-visualize")
+            call = self._diagram_pool.submit(self._visualize, idea_text)
+            self._visualize_calls[idea_text] = call
+
+        stored: Future = Future()
+
+        def store(done: Future) -> None:
+            try:
+                diagram_lines = done.result()
+                if idea_index in self.diagram_cache:
+                    stored.set_result(self.diagram_cache[idea_index])
+                else:
+                    stored.set_result(self._store_diagram(idea_index, diagram_lines))
+            except BaseException as e:
+                stored.set_exception(e)
+
+        self._diagram_futures[idea_index] = stored
+        call.add_done_callback(store)
+
+    def _visualize(self, idea_text: str) -> Optional[List[str]]:
+        """Make the VISUALIZE call for one idea text and parse it (pool worker)."""
+        system_prompt, _ = load_visualizer_prompt(idea_text)
+        return parse_diagram_only(self.llm_client.generate_raw(system_prompt, ""))
+
+    def _generate_diagrams_batch(self) -> None:
+        """Generate diagrams for all ideas with a single batch VISUALIZE call.
+
+        Ideas the response has no "Diagram <n>:" block for are then requested
+        per idea, concurrently; so is every idea if the batch call itself fails.
+        """
+        system_prompt, _ = load_batch_visualizer_prompt(self.ideas)
+        diagrams: Dict[int, Optional[List[str]]] = {}
+        try:
+            batch_raw = self.llm_client.generate_raw(system_prompt, "")
+        except Exception as exc:
+            if self.debug:
+                print(f"[debug] batch VISUALIZE failed, using per-idea calls: {exc!r}", file=sys.stderr)
+        else:
+            diagrams = parse_diagrams_batch(batch_raw)
+
+        missing: List[int] = []
+        for idea_index in range(len(self.ideas)):
+            n = idea_index + 1
+            if n in diagrams:
+                self._store_diagram(idea_index, diagrams[n], _BATCH_VISUALIZER_PROMPT_FILE)
+            else:
+                missing.append(idea_index)
+
+        if missing:
+            self._generate_diagrams_concurrently(missing)
+
+    def _generate_diagrams_concurrently(self, idea_indices: List[int]) -> None:
+        """Fan out one VISUALIZE call per idea concurrently and store the results.
+
+        Ideas whose call fails stay uncached and are retried individually on display.
+
+        Args:
+            idea_indices: 0-based indices of the ideas to visualize.
+        """
+        requests = [load_visualizer_prompt(self.ideas[i]) for i in idea_indices]
+        results = self.llm_client.generate_raw_many(requests)
+
+        for idea_index, diagram_raw in zip(idea_indices, results):
+            if isinstance(diagram_raw, BaseException):
+                continue
+            self._store_diagram(idea_index, parse_diagram_only(diagram_raw), _VISUALIZER_PROMPT_FILE)
+
     def _generate_diagram(self, idea_index: int) -> Optional[str]:
         """Generate diagram for idea at given index (0-based).
         
@@ -118,27 +414,52 @@ class ConversationProxy:
         if idea_index >= len(self.ideas):
             return None
 
-        # Skip diagram generation if no_idea_diagrams flag is set
-        if self.no_idea_diagrams:
+        # Skip diagram generation (no VISUALIZE call) if either flag is set
+        if not self._visualize_enabled():
             self.diagram_cache[idea_index] = None
             self.diagram_metadata[idea_index] = {
                 "diagram_generated": False,
                 "diagram_hidden": False,
-                "hidden_reason": "flag_no_idea_diagrams",
+                "hidden_reason": "flag_no_idea_diagrams" if self.no_idea_diagrams else "flag_no_diagrams",
                 "extra_tokens": [],
             }
             if self.run_path:
-                from .run_logger import save_diagram
                 save_diagram(self.run_path, idea_index + 1, "(none)")
             return None
 
+        future = self._diagram_futures.get(idea_index)
+        if future is not None:
+            try:
+                return future.result()
+            except Exception:
+                pass  # the eager call failed; retry it synchronously below
+
         idea_text = self.ideas[idea_index]
 
         # VISUALIZE call: diagram only
         system_prompt, _ = load_visualizer_prompt(idea_text)
         diagram_raw = self.llm_client.generate_raw(system_prompt, "")
-        diagram_lines = parse_diagram_only(diagram_raw)
+        # Batch runs record the prompt per idea, since some fall back to this call
+        prompt_file = _VISUALIZER_PROMPT_FILE if self.batch_diagrams else None
+        return self._store_diagram(idea_index, parse_diagram_only(diagram_raw), prompt_file)
+
+    def _store_diagram(
+        self,
+        idea_index: int,
+        diagram_lines: Optional[List[str]],
+        prompt_file: Optional[str] = None,
+    ) -> Optional[str]:
+        """Validate, cache and log parsed VISUALIZE output for one idea.
 
+        Args:
+            idea_index: 0-based index of the idea.
+            diagram_lines: Parsed diagram lines, or None if the model gave none.
+            prompt_file: Visualizer prompt the diagram came from, recorded in the
+                item metadata when it can differ between ideas (batch mode).
+
+        Returns:
+            Diagram text or None.
+        """
         # Track if diagram was generated (before validation)
         diagram_generated = diagram_lines is not None
         diagram_display: Optional[str] = None
@@ -146,20 +467,24 @@ class ConversationProxy:
         extra_tokens: List[str] = []
 
         if self.no_diagrams:
+            # Only reached in single_call mode, where diagrams arrive with the ideas
             diagram_display = None
             hidden_reason = "flag_no_diagrams"
         elif diagram_lines is None:
             diagram_display = None
             hidden_reason = None  # Not hidden, just not generated
         else:
-            # Validate diagram
-            result: DiagramValidationResult = validate_diagram(idea_text, diagram_lines)
+            # Validate diagram (joined once, for both validation and display)
+            diagram_block = "\n".join(diagram_lines)
+            result: DiagramValidationResult = validate_diagram_text(
+                self._idea_allowed[idea_index], diagram_block
+            )
             if should_hide_diagram(result):
                 diagram_display = None
                 hidden_reason = "validator_extra_tokens"
                 extra_tokens = list(result.extra_tokens)
             else:
-                diagram_display = "\n".join(diagram_lines)
+                diagram_display = diagram_block
                 hidden_reason = None
 
         # Cache result
@@ -172,10 +497,11 @@ class ConversationProxy:
             "hidden_reason": hidden_reason,
             "extra_tokens": extra_tokens,
         }
+        if prompt_file is not None:
+            self.diagram_metadata[idea_index]["visualizer_prompt_file"] = prompt_file
 
         # Save diagram if logging
         if self.run_path:
-            from .run_logger import save_diagram
             diagram_text = diagram_display if diagram_display else "(none)"
             save_diagram(self.run_path, idea_index + 1, diagram_text)
 
@@ -189,6 +515,7 @@ class ConversationProxy:
         Returns:
             Chunk dict with 'idea', 'diagram' (or None), and optional '_debug'.
         """
+        self._wait_for_ideas(self.current_index + 1)
         if self.current_index >= len(self.ideas):
             return None
 
@@ -209,7 +536,12 @@ class ConversationProxy:
         return chunk
 
     def has_next(self) -> bool:
-        """Return True if there are more ideas after the current one."""
+        """Return True if there are more ideas after the current one.
+
+        While the EXPLAIN response is still streaming, waits until the next idea
+        arrives or the stream ends.
+        """
+        self._wait_for_ideas(self.current_index + 2)
         return self.current_index < len(self.ideas) - 1
 
     def next(self) -> bool:
@@ -239,28 +571,36 @@ class ConversationProxy:
         if not self.run_path:
             return
 
-        from .run_logger import save_run_metadata, save_nlp_diagram
-        from .nlp_import import is_nlp_available, get_nlp_functions
+        self._wait_for_ideas()
+        if self._diagram_pool is not None:
+            # Let in-flight VISUALIZE calls land so run.json matches diagrams/
+            self._diagram_pool.shutdown(wait=True)
+            self._diagram_pool = None
 
         # Build items list
         items = []
-        nlp_available = self.nlp_shadow and is_nlp_available()
-        analyze_sentence, render_diagram = get_nlp_functions() if nlp_available else (None, None)
+        if self._nlp_functions is None:
+            # Imported only now, so startup never pays for nlp_diagrammer
+            self._nlp_functions = get_nlp_functions() if self.nlp_shadow else (None, None)
+        analyze_sentence, render_diagram = self._nlp_functions
+        nlp_available = analyze_sentence is not None and render_diagram is not None
         
-        for i in range(len(self.ideas)):
-            meta = self.diagram_metadata.get(i, {})
+        diagram_metadata = self.diagram_metadata
+        for i, idea_text in enumerate(self.ideas):
+            meta = diagram_metadata.get(i) or _NO_METADATA
             item = {
                 "index": i + 1,  # 1-based
-                "idea_text": self.ideas[i],
+                "idea_text": idea_text,
                 "diagram_generated": meta.get("diagram_generated", False),
                 "diagram_hidden": meta.get("diagram_hidden", False),
                 "hidden_reason": meta.get("hidden_reason"),
                 "extra_tokens": meta.get("extra_tokens", []),
             }
+            if "visualizer_prompt_file" in meta:
+                item["visualizer_prompt_file"] = meta["visualizer_prompt_file"]
             
             # Compute NLP shadow data
-            if nlp_available and analyze_sentence and render_diagram:
-                idea_text = self.ideas[i]
+            if nlp_available:
                 try:
                     analysis = analyze_sentence(idea_text)
                     lines = render_diagram(idea_text)
@@ -298,9 +638,17 @@ class ConversationProxy:
             user_prompt=self.user_prompt or "",
             explainer_model=self.explainer_model,
             visualizer_model=self.visualizer_model,
-            explainer_prompt_file="prompts/explainer_v1.md",
-            visualizer_prompt_file="prompts/visualizer_v1.md",
-            diagram_policy="eager",
+            explainer_prompt_file=(
+                "prompts/upstream_prompt_template.md" if self.single_call else "prompts/explainer_v1.md"
+            ),
+            visualizer_prompt_file=(
+                "prompts/upstream_prompt_template.md" if self.single_call
+                else _BATCH_VISUALIZER_PROMPT_FILE if self.batch_diagrams
+                else _VISUALIZER_PROMPT_FILE
+            ),
+            diagram_policy=(
+                "single_call" if self.single_call else "batch" if self.batch_diagrams else "eager"
+            ),
             validator_enabled=True,
             validator_max_extras=0,
             ideas=self.ideas,
@@ -308,10 +656,34 @@ class ConversationProxy:
             concept_map_generated=self.map_first and self.concept_map_text is not None,
             concept_map_prompt_version="map_visualizer_v1" if self.map_first else None,
             concept_map_model=self.map_visualizer_model if self.map_first else None,
+            created_at=self._created_at,
+            explain_truncated=self._ideas_error is not None,
         )
+        # run.arrow is an optional sidecar; run.json above is the record
+        try:
+            save_run_arrow(self.run_path, items)
+        except Exception as exc:
+            if self.debug:
+                print(f"[debug] run.arrow not written: {exc!r}", file=sys.stderr)
+
+    def close(self) -> None:
+        """Abandon the run's pending VISUALIZE calls (interrupt or error exit).
+
+        Queued calls are cancelled so they are never sent (cancelled by hand:
+        Python 3.8's shutdown() has no cancel_futures); calls already in flight
+        are not waited for. No new calls are scheduled afterwards.
+        """
+        with self._ideas_cond:
+            self._closed = True
+            for call in self._visualize_calls.values():
+                call.cancel()  # also settles the matching _diagram_futures entries
+            if self._diagram_pool is not None:
+                self._diagram_pool.shutdown(wait=False)
+                self._diagram_pool = None
 
     def get_session_state(self) -> dict:
         """Return current session state for debugging/inspection."""
+        self._wait_for_ideas()
         return {
             "user_prompt": self.user_prompt,
             "ideas": self.ideas,
@@ -9,13 +9,36 @@ from typing import Any, Dict, List, Optional
 
 from .prompts.loader import load_prompt_text, sha256
 
+try:
+    import orjson  # optional: C serializer, same output as the json fallback
+except ImportError:
+    orjson = None
 
-def create_run_dir(log_dir: Path, user_prompt: str) -> Path:
+
+class _SlugTable(dict):
+    """str.translate table: alphanumerics, '-' and '_' kept, anything else -> '_'.
+
+    Code points are classified on first sight and cached, so translate stays in C.
+    """
+
+    def __missing__(self, codepoint: int) -> int:
+        c = chr(codepoint)
+        self[codepoint] = value = codepoint if c.isalnum() or c in "-_" else ord("_")
+        return value
+
+
+_SLUG_TABLE = _SlugTable()
+
+
+def create_run_dir(
+    log_dir: Path, user_prompt: str, now: Optional[datetime] = None
+) -> Path:
     """Create a new run directory with timestamp and slug.
     
     Args:
         log_dir: Base log directory (e.g., ./runs).
         user_prompt: User prompt for slug generation.
+        now: Run start time; defaults to the current time.
         
     Returns:
         Path to the created run directory.
@@ -23,11 +46,12 @@ def create_run_dir(log_dir: Path, user_prompt: str) -> Path:
     log_dir.mkdir(parents=True, exist_ok=True)
     
     # Generate slug from prompt (first 30 chars, sanitized)
-    slug = "".join(c if c.isalnum() or c in "-_" else "_" for c in user_prompt[:30])
+    slug = user_prompt[:30].translate(_SLUG_TABLE)
     slug = slug.strip("_") or "run"
     
     # Timestamp: YYYY-MM-DD_HHMMSS
-    now = datetime.now()
+    if now is None:
+        now = datetime.now()
     timestamp = now.strftime("%Y-%m-%d_%H%M%S")
     
     run_name = f"{timestamp}_{slug}"
@@ -55,6 +79,8 @@ def save_run_metadata(
     concept_map_generated: bool = False,
     concept_map_prompt_version: Optional[str] = None,
     concept_map_model: Optional[str] = None,
+    created_at: Optional[datetime] = None,
+    explain_truncated: bool = False,
 ) -> None:
     """Save run.json metadata file.
     
@@ -70,6 +96,10 @@ def save_run_metadata(
         validator_max_extras: Max extra tokens allowed.
         ideas: List of idea strings.
         items: List of item metadata dicts.
+        created_at: Run start time (as passed to create_run_dir); defaults
+            to the current time.
+        explain_truncated: The EXPLAIN response failed part-way; ideas holds
+            only the ideas received before the failure.
     """
     # Load prompt texts and compute hashes
     explainer_prompt_text = load_prompt_text(explainer_prompt_file)
@@ -77,7 +107,7 @@ def save_run_metadata(
     
     metadata = {
         "version": 2,
-        "created_at": datetime.now().isoformat(),
+        "created_at": (created_at or datetime.now()).isoformat(),
         "user_prompt": user_prompt,
         "explainer": {
             "model": explainer_model,
@@ -105,10 +135,53 @@ def save_run_metadata(
             metadata["concept_map_prompt_version"] = concept_map_prompt_version
         if concept_map_model:
             metadata["concept_map_model"] = concept_map_model
+
+    if explain_truncated:
+        metadata["explain_truncated"] = True
     
     run_json_path = run_path / "run.json"
-    with open(run_json_path, "w", encoding="utf-8") as f:
-        json.dump(metadata, f, indent=2, ensure_ascii=False)
+    _write_json(run_json_path, metadata)
+
+
+def save_run_arrow(run_path: Path, items: List[Dict[str, Any]]) -> bool:
+    """Save the run.json items as a columnar Arrow IPC file (run.arrow).
+
+    A sidecar for tools that scan many runs: columns can be memory-mapped and
+    filtered without parsing JSON. run.json stays the source of truth. Needs
+    the optional pyarrow dependency; without it nothing is written.
+
+    Args:
+        run_path: Run directory path.
+        items: Item metadata dicts, as passed to save_run_metadata.
+
+    Returns:
+        True if run.arrow was written, False if pyarrow is not installed.
+    """
+    pa = _pyarrow()
+    if pa is None:
+        return False
+
+    nlp = [item.get("nlp") or {} for item in items]
+    table = pa.table(
+        {
+            "index": pa.array([item["index"] for item in items], pa.int32()),
+            "idea_text": pa.array([item["idea_text"] for item in items], pa.string()),
+            "diagram_generated": pa.array(
+                [item["diagram_generated"] for item in items], pa.bool_()
+            ),
+            "diagram_hidden": pa.array([item["diagram_hidden"] for item in items], pa.bool_()),
+            "hidden_reason": pa.array([item["hidden_reason"] for item in items], pa.string()),
+            "extra_tokens": pa.array(
+                [list(item["extra_tokens"]) for item in items], pa.list_(pa.string())
+            ),
+            "nlp_diagram": pa.array([n.get("diagram") for n in nlp], pa.string()),
+            "nlp_confidence": pa.array([n.get("confidence") for n in nlp], pa.float64()),
+        }
+    )
+    with pa.OSFile(str(run_path / "run.arrow"), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return True
 
 
 def save_explain_output(run_path: Path, explain_text: str) -> None:
@@ -130,8 +203,7 @@ def save_ideas(run_path: Path, ideas: List[str]) -> None:
         ideas: List of idea strings.
     """
     ideas_path = run_path / "ideas.json"
-    with open(ideas_path, "w", encoding="utf-8") as f:
-        json.dump(ideas, f, indent=2, ensure_ascii=False)
+    _write_json(ideas_path, ideas)
 
 
 def save_diagram(run_path: Path, index: int, diagram_text: str) -> None:
@@ -211,8 +283,26 @@ def load_run_metadata(run_path: Path) -> Dict[str, Any]:
     if not run_json_path.exists():
         raise FileNotFoundError(f"run.json not found in {run_path}")
     
-    with open(run_json_path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _read_json(run_json_path)
+
+
+def load_run_arrow(run_path: Path) -> Any:
+    """Load run.arrow as a pyarrow Table, memory-mapped.
+
+    Args:
+        run_path: Run directory path.
+
+    Returns:
+        pyarrow.Table with one row per idea, or None if run.arrow doesn't
+        exist or pyarrow is not installed.
+    """
+    arrow_path = run_path / "run.arrow"
+    pa = _pyarrow()
+    if pa is None or not arrow_path.exists():
+        return None
+
+    with pa.memory_map(str(arrow_path), "r") as source:
+        return pa.ipc.open_file(source).read_all()
 
 
 def load_ideas(run_path: Path) -> List[str]:
@@ -231,8 +321,7 @@ def load_ideas(run_path: Path) -> List[str]:
     if not ideas_path.exists():
         raise FileNotFoundError(f"ideas.json not found in {run_path}")
     
-    with open(ideas_path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _read_json(ideas_path)
 
 
 def load_diagram(run_path: Path, index: int) -> Optional[str]:
@@ -250,3 +339,69 @@ def load_diagram(run_path: Path, index: int) -> Optional[str]:
         return None
     
     return diagram_path.read_text(encoding="utf-8").strip()
+
+
+def load_all_diagrams(run_path: Path, count: int) -> List[Optional[str]]:
+    """Load diagrams/001.txt .. diagrams/NNN.txt in one pass.
+    
+    Args:
+        run_path: Run directory path.
+        count: Number of ideas in the run.
+        
+    Returns:
+        List indexed by 0-based idea index; each entry is as load_diagram returns.
+    """
+    from ._uring_loader import batch_read_files, is_uring_available
+
+    diagrams_dir = run_path / "diagrams"
+
+    # Linux + liburing: submit every read at once, fall back to plain reads on any failure
+    if is_uring_available():
+        paths = [diagrams_dir / f"{index:03d}.txt" for index in range(1, count + 1)]
+        try:
+            contents = batch_read_files(paths)
+        except Exception:
+            pass
+        else:
+            return [None if b is None else b.decode("utf-8").strip() for b in contents]
+
+    diagrams: List[Optional[str]] = []
+    for index in range(1, count + 1):
+        try:
+            text = (diagrams_dir / f"{index:03d}.txt").read_text(encoding="utf-8")
+        except FileNotFoundError:
+            diagrams.append(None)
+        else:
+            diagrams.append(text.strip())
+    return diagrams
+
+
+def _write_json(path: Path, obj: Any) -> None:
+    """Write obj as 2-space-indented UTF-8 JSON (non-ASCII kept as-is)."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+
+
+def _read_json(path: Path) -> Any:
+    """Read a JSON file written by _write_json."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _pyarrow() -> Any:
+    """Return the pyarrow module, or None if it is not installed.
+
+    Imported on first use: pyarrow is slow to import and only the Arrow
+    sidecar needs it.
+    """
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+    except ImportError:
+        return None
+    return pyarrow
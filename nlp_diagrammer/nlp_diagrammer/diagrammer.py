@@ -1,4 +1,6 @@
 import re
+from functools import lru_cache
+
 from .templates import template_priority, template_compare, template_category
 from .utils import clean_text
 from .heuristics import (
@@ -13,13 +15,16 @@ from .heuristics import (
 ALL_COMPARE = COMPARE_MARKERS | PREFERENCE_MARKERS
 ALL_PRIORITY = PRIORITY_VERBS | PROPERTY_VERBS
 
+# Constraint extraction: "... without X, ..." -> "No X"
+_WITHOUT_RE = re.compile(r'\bwithout\b', re.IGNORECASE)
+_CONSTRAINT_HEAD_RE = re.compile(r'^([^.,:;]+)')
+
 def extract_info(idea_text: str, template_type: str = 'category') -> dict:
     """
     Heuristic extraction of semantic components.
     """
     text = clean_text(idea_text)
     words = text.split()
-    lower_words = [w.lower().rstrip('.,:;') for w in words]
     
     # Identify Template Type (Now passed in or determined externally, but keeping fallback logic for extraction if needed)
     # We rely on the passed 'template_type' now.
@@ -34,30 +39,25 @@ def extract_info(idea_text: str, template_type: str = 'category') -> dict:
     # Heuristic: Find the main verb/pivot
     pivot_idx = -1
     pivot_word = ''
+    # Improved Subject Logic: first priority verb before the pivot, if any
+    verb_idx = -1
     
-    if template_type == 'compare':
-        for i, w in enumerate(lower_words):
-            if w in ALL_COMPARE:
-                pivot_idx = i
-                pivot_word = words[i]
-                break
-    elif template_type == 'priority':
-        for i, w in enumerate(lower_words):
-            if w in ALL_PRIORITY:
+    if template_type in ('compare', 'priority'):
+        pivots = ALL_COMPARE if template_type == 'compare' else ALL_PRIORITY
+        # One pass: stop at the pivot, noting a priority verb on the way.
+        # (For 'priority' the first such verb is the pivot itself.)
+        for i, w in enumerate(words):
+            lw = w.lower().rstrip('.,:;')
+            if lw in pivots:
                 pivot_idx = i
-                pivot_word = words[i]
+                pivot_word = w
                 break
+            if verb_idx < 0 and lw in ALL_PRIORITY:
+                verb_idx = i
     
     # Subject Extraction
     if pivot_idx > 0:
-        # Improved Subject Logic:
         # If there is a verb before the main pivot, split there.
-        verb_idx = -1
-        for i in range(pivot_idx):
-             if lower_words[i] in ALL_PRIORITY: 
-                 verb_idx = i
-                 break
-        
         if verb_idx > -1 and template_type == 'compare':
              info['subject'] = " ".join(words[:verb_idx])
              info['compare_targets'] = [
@@ -79,11 +79,11 @@ def extract_info(idea_text: str, template_type: str = 'category') -> dict:
         info['subject'] = words[0] if words else "Unknown"
         info['action'] = " ".join(words[1:]) if len(words) > 1 else ""
 
-    # Constraint Extraction (Global check)
-    without_matches = re.split(r'\bwithout\b', text, flags=re.IGNORECASE)
+    # Constraint Extraction (Global check); most ideas have no "without" at all
+    without_matches = _WITHOUT_RE.split(text) if 'without' in text.lower() else ()
     if len(without_matches) > 1:
         constraint_part = without_matches[1].strip()
-        width_match = re.match(r'^([^.,:;]+)', constraint_part)
+        width_match = _CONSTRAINT_HEAD_RE.match(constraint_part)
         if width_match:
             info['constraints'].append(f"No {width_match.group(1)}")
             if 'priority_target' in info:
@@ -101,7 +101,15 @@ def explain_parse(idea_text: str) -> dict:
 def render_diagram(idea_text: str) -> list[str] | None:
     """
     Main entry point: text -> ASCII lines.
+    
+    Results are cached per idea text; each call returns a fresh list.
     """
+    lines = _render_cached(idea_text)
+    return None if lines is None else list(lines)
+
+
+@lru_cache(maxsize=4096)
+def _render_cached(idea_text: str) -> tuple[str, ...] | None:
     kind, _ = select_template(idea_text)
     if not kind:
         return None
@@ -109,8 +117,8 @@ def render_diagram(idea_text: str) -> list[str] | None:
     info = extract_info(idea_text, template_type=kind)
     
     if info['template_type'] == 'priority':
-        return template_priority(info)
+        return tuple(template_priority(info))
     elif info['template_type'] == 'compare':
-        return template_compare(info)
+        return tuple(template_compare(info))
     else:
-        return template_category(info)
+        return tuple(template_category(info))
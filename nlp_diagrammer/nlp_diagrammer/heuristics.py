@@ -1,38 +1,47 @@
 import re
+from functools import lru_cache
+
 from .utils import clean_text
 
 # Heuristic Constants
+# Frozen: analyze_sentence caches its results, so the marker sets must not change at runtime.
 
 # 1. Compare / Trade-off
-COMPARE_MARKERS = {'vs', 'versus', 'whereas', 'while', 'but'}
-PREFERENCE_MARKERS = {'over', 'rather than', 'instead of', 'more than', 'less than'}
+COMPARE_MARKERS = frozenset({'vs', 'versus', 'whereas', 'while', 'but'})
+PREFERENCE_MARKERS = frozenset({'over', 'rather than', 'instead of', 'more than', 'less than'})
 
 # 2. Taxonomy / Categorization
-TAXONOMY_MARKERS = {'can be', 'either', 'types of', 'classified as', 'category', 'kinds of'}
+TAXONOMY_MARKERS = frozenset({'can be', 'either', 'types of', 'classified as', 'category', 'kinds of'})
 # "X are Y" pattern is harder with regex, handling via best-effort or specific phrasing if needed.
 # For now, relying on explicit markers + simple pattern matching if applicable.
 
 # 3. Part-whole / Composition
-COMPOSITION_MARKERS = {'consists of', 'includes', 'contains', 'made of', 'composed of', 'has'}
+COMPOSITION_MARKERS = frozenset({'consists of', 'includes', 'contains', 'made of', 'composed of', 'has'})
 
 # 4. Properties / Constraints
-PROPERTY_VERBS = {'ensures', 'provides', 'offers', 'supports', 'enforces', 'guarantees', 'prioritizes'} # Added prioritizes which was in original diagrammer
+PROPERTY_VERBS = frozenset({'ensures', 'provides', 'offers', 'supports', 'enforces', 'guarantees', 'prioritizes'}) # Added prioritizes which was in original diagrammer
 PRIORITY_VERBS = PROPERTY_VERBS # Alias for diagrammer compatibility
-CONSTRAINT_PHRASES = {'without', 'with'} # "in <noun>" is cautious
+CONSTRAINT_PHRASES = frozenset({'without', 'with'}) # "in <noun>" is cautious
 
 # 5. Role Differentiation
 # Harder to capture with simple sets, relies on structure analysis (two agents, parallelism).
 
 # Anti-signals
-ANTI_ADJECTIVES = {'important', 'critical', 'matters', 'essential'} # + "is/are"
-IDIOM_DENYLIST = {'safety first', 'security first', 'less is more'}
-MECHANISM_MARKERS = {'first', 'then', 'next', 'after', 'before', 'until', 'because', 'so that', 'therefore'}
+ANTI_ADJECTIVES = frozenset({'important', 'critical', 'matters', 'essential'}) # + "is/are"
+IDIOM_DENYLIST = frozenset({'safety first', 'security first', 'less is more'})
+MECHANISM_MARKERS = frozenset({'first', 'then', 'next', 'after', 'before', 'until', 'because', 'so that', 'therefore'})
+
+# Every marker matched as a whole word (as opposed to a substring of the text),
+# so one set intersection over the tokens finds all word-level hits at once.
+_WORD_MARKERS = COMPARE_MARKERS | PROPERTY_VERBS | CONSTRAINT_PHRASES | MECHANISM_MARKERS
 
 
 def analyze_sentence(text: str) -> dict:
     """
     Analyze a sentence to determine if it is diagram-worthy and what kind of diagram it fits.
     
+    Results are cached per sentence; each call returns a fresh copy.
+    
     Returns:
         {
           "diagram_worthy": bool,
@@ -41,10 +50,18 @@ def analyze_sentence(text: str) -> dict:
           "reasons": [str, ...]
         }
     """
+    analysis = _analyze_cached(text)
+    return {**analysis, "reasons": list(analysis["reasons"])}
+
+
+@lru_cache(maxsize=4096)
+def _analyze_cached(text: str) -> dict:
+    # Shared across callers: analyze_sentence copies it before handing it out.
     clean = clean_text(text)
     # preserve original casing for some heuristics if needed, but mostly lowered for keywords
     lower_text = clean.lower()
     words = lower_text.split()
+    word_hits = _WORD_MARKERS.intersection(words)
     
     reasons = []
     
@@ -67,7 +84,7 @@ def analyze_sentence(text: str) -> dict:
     
     # C) Mechanism-heavy (temporal/process)
     # If mechanism markers present, heavy penalty or disqualify.
-    mechanism_hits = [m for m in MECHANISM_MARKERS if m in words] # strict word match for some
+    mechanism_hits = [m for m in MECHANISM_MARKERS if m in word_hits] # strict word match for some
     # Some markers like "first" might be valid in "Safety first" (idiom) but also "First, do X". 
     # The spec says "Mechanism-heavy ... v0 should not".
     if mechanism_hits:
@@ -91,12 +108,11 @@ def analyze_sentence(text: str) -> dict:
     
     # 1. Compare / Trade-off (HIGH)
     # specific markers
-    has_compare = any(m in words for m in COMPARE_MARKERS)
-    has_preference = any(p in lower_text for p in PREFERENCE_MARKERS) # phrases need text search
+    compare_hits = [m for m in COMPARE_MARKERS if m in word_hits]
+    preference_hits = [p for p in PREFERENCE_MARKERS if p in lower_text] # phrases need text search
     
-    if has_compare or has_preference:
-        markers = [m for m in COMPARE_MARKERS if m in words] + \
-                  [p for p in PREFERENCE_MARKERS if p in lower_text]
+    if compare_hits or preference_hits:
+        markers = compare_hits + preference_hits
         return {
             "diagram_worthy": True,
             "diagram_kind": "compare",
@@ -105,9 +121,8 @@ def analyze_sentence(text: str) -> dict:
         }
         
     # 2. Part-whole / Composition (HIGH) -> 'category'
-    has_composition = any(m in lower_text for m in COMPOSITION_MARKERS)
-    if has_composition:
-        markers = [m for m in COMPOSITION_MARKERS if m in lower_text]
+    markers = [m for m in COMPOSITION_MARKERS if m in lower_text]
+    if markers:
         return {
             "diagram_worthy": True,
             "diagram_kind": "category",
@@ -116,12 +131,11 @@ def analyze_sentence(text: str) -> dict:
         }
         
     # 3. Taxonomy / Categorization (HIGH) -> 'category'
-    has_taxonomy = any(m in lower_text for m in TAXONOMY_MARKERS)
+    markers = [m for m in TAXONOMY_MARKERS if m in lower_text]
     # Check for "or" lists which might be categorization "A, B, or C"
     has_or_list = ' or ' in lower_text and ',' in lower_text
     
-    if has_taxonomy or has_or_list:
-        markers = [m for m in TAXONOMY_MARKERS if m in lower_text]
+    if markers or has_or_list:
         if has_or_list: markers.append("list with 'or'")
         return {
             "diagram_worthy": True,
@@ -132,13 +146,11 @@ def analyze_sentence(text: str) -> dict:
     
     # 4. Properties / Constraints (MEDIUM-HIGH) -> 'priority'
     # property verbs
-    has_prop_verb = any(v in words for v in PROPERTY_VERBS)
+    markers = [v for v in PROPERTY_VERBS if v in word_hits]
     # constraint phrases
-    has_constraint = any(c in words for c in CONSTRAINT_PHRASES)
+    markers += [c for c in CONSTRAINT_PHRASES if c in word_hits]
     
-    if has_prop_verb or has_constraint:
-        markers = [v for v in PROPERTY_VERBS if v in words] + \
-                  [c for c in CONSTRAINT_PHRASES if c in words]
+    if markers:
         return {
             "diagram_worthy": True,
             "diagram_kind": "priority",
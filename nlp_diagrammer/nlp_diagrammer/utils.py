@@ -1,8 +1,8 @@
 import re
 
-ALLOWED_GLUE = {
+ALLOWED_GLUE = frozenset({
     'priority:', 'constraints:', '|', '->', ',', ':'
-}
+})
 
 def clean_text(text: str) -> str:
     """Standardize whitespace."""
@@ -16,8 +16,9 @@ def center_text(text: str, width: int) -> str:
     """Center text within a fixed width."""
     if len(text) >= width:
         return text[:width]
-    padding = (width - len(text)) // 2
-    return " " * padding + text + " " * (width - len(text) - padding)
+    # Odd padding goes on the right. (str.center() would sometimes put it on
+    # the left, shifting existing diagrams by a column.)
+    return text.rjust((width + len(text)) // 2).ljust(width)
 
 def format_box(text: str, width: int = 20, style: str = "box") -> list[str]:
     """Create a simple ASCII box around text."""
@@ -27,15 +28,16 @@ def format_box(text: str, width: int = 20, style: str = "box") -> list[str]:
         text = text[:inner_width-3] + "..."
     
     centered = center_text(text, inner_width)
+    rule = '-' * inner_width
     if style == "round":
         return [
-            f"/{'-'*inner_width}\\",
+            f"/{rule}\\",
             f"|{centered}|",
-            f"\\{'-'*inner_width}/"
+            f"\\{rule}/"
         ]
     return [
-        f"+{'-'*inner_width}+",
+        f"+{rule}+",
         f"|{centered}|",
-        f"+{'-'*inner_width}+"
+        f"+{rule}+"
     ]
 
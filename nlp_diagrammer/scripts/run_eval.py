@@ -1,6 +1,12 @@
 import json
 import os
 import sys
+import time
+
+try:
+    import orjson  # optional: faster test case parsing
+except ImportError:
+    orjson = None
 # Ensure we can import the package
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
@@ -12,54 +18,52 @@ def main():
     
     # Load test cases
     test_path = os.path.join(os.path.dirname(__file__), '../tests/test_cases.json')
-    with open(test_path, 'r') as f:
-        cases = json.load(f)
+    with open(test_path, 'rb') as f:
+        data = f.read()
+    cases = orjson.loads(data) if orjson is not None else json.loads(data)
         
     out_dir = os.path.join(os.path.dirname(__file__), '../out')
     os.makedirs(out_dir, exist_ok=True)
     
-    report_lines = ["# Evaluation Report\n"]
+    ts = int(time.time())
     
     passed = 0
     total = len(cases)
     
-    for case in cases:
-        idea = case['input']
-        
-        # Get heuristic analysis for debugging
-        kind, analysis = select_template(idea)
+    # Stream the report case by case rather than holding it all in memory
+    with open(os.path.join(out_dir, f"eval_{ts}.md"), 'w', buffering=1 << 20) as report:
+        report.write("# Evaluation Report\n")
         
-        diagram = render_diagram(idea)
-        
-        report_lines.append(f"## Case {case['id']}: {idea}")
-        report_lines.append(f"- Derived Kind: {kind}")
-        report_lines.append(f"- Confidence: {analysis.get('confidence', 0.0)}")
-        report_lines.append(f"- Reasons: {analysis.get('reasons', [])}")
-        
-        if diagram is None:
-            report_lines.append("- Result: NONE (Failed to parse)")
-            continue
+        for case in cases:
+            idea = case['input']
             
-        report_lines.append("```")
-        for line in diagram:
-            report_lines.append(line)
-        report_lines.append("```")
-        
-        # Check constraints
-        if len(diagram) > 8:
-             report_lines.append("- FAIL: Line count > 8")
-        else:
-             report_lines.append("- PASS: Line count constraint")
-             passed += 1
+            # Get heuristic analysis for debugging
+            kind, analysis = select_template(idea)
+            
+            diagram = render_diagram(idea)
+            
+            report.write(f"\n## Case {case['id']}: {idea}")
+            report.write(f"\n- Derived Kind: {kind}")
+            report.write(f"\n- Confidence: {analysis.get('confidence', 0.0)}")
+            report.write(f"\n- Reasons: {analysis.get('reasons', [])}")
+            
+            if diagram is None:
+                report.write("\n- Result: NONE (Failed to parse)")
+                continue
+                
+            report.write("\n```")
+            for line in diagram:
+                report.write(f"\n{line}")
+            report.write("\n```")
+            
+            # Check constraints
+            if len(diagram) > 8:
+                 report.write("\n- FAIL: Line count > 8")
+            else:
+                 report.write("\n- PASS: Line count constraint")
+                 passed += 1
 
-    report_content = "\n".join(report_lines)
     print(f"Passed {passed}/{total} basic checks.")
-    
-    # Write report
-    import time
-    ts = int(time.time())
-    with open(os.path.join(out_dir, f"eval_{ts}.md"), 'w') as f:
-        f.write(report_content)
     print(f"Report written to out/eval_{ts}.md")
 
 if __name__ == "__main__":
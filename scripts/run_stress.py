@@ -5,6 +5,8 @@ Stress test automation runner for CPP.
 This script:
 - reads stress prompts from stress/prompts.json
 - invokes `cpp ask ...` for each prompt in a non-interactive way
+- runs the prompts concurrently (--jobs N, default: 4), each logging
+  into its own subfolder of --log-dir
 - captures the created run folder path
 - summarizes diagram outcomes from run.json for each run
 - writes a summary CSV + markdown report
@@ -18,18 +20,28 @@ from __future__ import annotations
 
 import csv
 import json
-import os
-import re
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-RUN_DIR_RE = re.compile(r"(?:Run saved to:|run directory:|Created run:)\s*(.+)$", re.IGNORECASE)
+try:
+    import orjson  # optional: faster parsing of run.json / prompts.json
+except ImportError:
+    orjson = None
 
-@dataclass
+USAGE = (
+    "usage: run_stress.py [--prompts PATH] [--log-dir DIR] [--jobs N] [--no-diagrams]\n"
+    "  --jobs N  number of prompts run concurrently, N >= 1 (default: 4)"
+)
+
+# slots=True needs Python 3.10; cpp itself supports 3.8
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class RunSummary:
     prompt_id: str
     prompt: str
@@ -43,7 +55,7 @@ class RunSummary:
     nlp_diagrams_present: int = 0
 
 def _load_prompts(prompts_path: Path) -> List[Dict[str, str]]:
-    data = json.loads(prompts_path.read_text(encoding="utf-8"))
+    data = _read_json(prompts_path)
     if not isinstance(data, list):
         raise ValueError("prompts.json must be a list")
     for item in data:
@@ -51,14 +63,11 @@ def _load_prompts(prompts_path: Path) -> List[Dict[str, str]]:
             raise ValueError("Each prompt entry must have id and prompt")
     return data
 
-def _find_latest_run(log_dir: Path) -> Optional[Path]:
+def _created_run(log_dir: Path) -> Optional[Path]:
+    """The run folder cpp created in a log dir used for that one invocation only."""
     if not log_dir.exists():
         return None
-    runs = [p for p in log_dir.iterdir() if p.is_dir()]
-    if not runs:
-        return None
-    runs.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-    return runs[0]
+    return next((p for p in log_dir.iterdir() if p.is_dir() and not p.name.startswith(".")), None)
 
 def _invoke_cpp(prompt: str, log_dir: Path, extra_args: List[str]) -> Tuple[int, str, str]:
     # Try 'cpp' command first, fall back to 'python -m cpp.cli' if not available
@@ -97,7 +106,12 @@ def _load_run_json(run_path: Path) -> Dict:
     run_json = run_path / "run.json"
     if not run_json.exists():
         raise FileNotFoundError(f"Missing run.json in {run_path}")
-    return json.loads(run_json.read_text(encoding="utf-8"))
+    return _read_json(run_json)
+
+def _read_json(path: Path) -> Any:
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_text(encoding="utf-8"))
 
 def _summarize(run: Dict) -> Tuple[int,int,int,int,int]:
     """
@@ -110,23 +124,65 @@ def _summarize(run: Dict) -> Tuple[int,int,int,int,int]:
     nlp_diagrams_present: count where nlp.diagram is not None
     Note: '(none)' from visualizer should set diagram_generated=false, so it won't count.
     """
-    items = run.get("items", [])
-    generated = sum(1 for it in items if it.get("diagram_generated") is True)
-    hidden = sum(1 for it in items if it.get("diagram_hidden") is True)
-    shown = max(0, generated - hidden)
-    
+    generated = hidden = 0
     # NLP metrics (version 2+)
-    nlp_attempted = 0
-    nlp_diagrams_present = 0
-    for it in items:
-        nlp = it.get("nlp", {})
-        if nlp.get("attempted") is True:
+    nlp_attempted = nlp_diagrams_present = 0
+    # One pass over the items for all counters
+    for it in run.get("items", []):
+        get = it.get
+        if get("diagram_generated") is True:
+            generated += 1
+        if get("diagram_hidden") is True:
+            hidden += 1
+        nlp = get("nlp")
+        if nlp and nlp.get("attempted") is True:
             nlp_attempted += 1
             if nlp.get("diagram") is not None:
                 nlp_diagrams_present += 1
+    shown = max(0, generated - hidden)
     
     return generated, hidden, shown, nlp_attempted, nlp_diagrams_present
 
+def _run_one(entry: Dict[str, str], log_dir: Path, out_dir: Path, stamp: str, extra_args: List[str]) -> Optional[RunSummary]:
+    """Run one prompt through cpp and summarize its run.json (None on failure)."""
+    pid = entry["id"]
+    ptext = entry["prompt"]
+
+    # A log dir per prompt per stress session: the only run in it is this invocation's,
+    # so no scanning for the newest folder (and no race with concurrent prompts)
+    run_log_dir = log_dir / f"{pid}_{stamp}"
+    rc, out, err = _invoke_cpp(ptext, log_dir=run_log_dir, extra_args=extra_args)
+    if rc != 0:
+        print(f"[FAIL] {pid}: cpp exited {rc}\nSTDOUT:\n{out}\nSTDERR:\n{err}", file=sys.stderr)
+        return None
+
+    run_path = _created_run(run_log_dir)
+    if run_path is None:
+        print(f"[FAIL] {pid}: could not locate run folder in {run_log_dir}", file=sys.stderr)
+        return None
+
+    run = _load_run_json(run_path)
+    ideas_count = int(run.get("ideas_count", len(run.get("items", []))) or 0)
+    generated, hidden, shown, nlp_attempted, nlp_diagrams_present = _summarize(run)
+
+    # Save per-run stdout/stderr for debugging
+    (out_dir / f"{pid}_stdout.txt").write_text(out, encoding="utf-8")
+    (out_dir / f"{pid}_stderr.txt").write_text(err, encoding="utf-8")
+
+    hidden_rate = (hidden / generated) if generated else 0.0
+    return RunSummary(
+        prompt_id=pid,
+        prompt=ptext,
+        run_path=str(run_path),
+        ideas_count=ideas_count,
+        diagrams_generated=generated,
+        diagrams_hidden=hidden,
+        diagrams_shown=shown,
+        hidden_rate=hidden_rate,
+        nlp_attempted=nlp_attempted,
+        nlp_diagrams_present=nlp_diagrams_present,
+    )
+
 def main() -> int:
     root = Path(__file__).resolve().parents[1]  # repo root when scripts/ is under repo
     prompts_path = root / "stress" / "prompts.json"
@@ -141,6 +197,15 @@ def main() -> int:
         i = args.index("--log-dir")
         log_dir = Path(args[i+1]).expanduser().resolve()
 
+    jobs = 4
+    if "--jobs" in args:
+        i = args.index("--jobs")
+        value = args[i+1] if i + 1 < len(args) else ""
+        if not value.isdigit() or int(value) < 1:
+            print(USAGE, file=sys.stderr)
+            return 2
+        jobs = int(value)
+
     extra_args: List[str] = []
     if "--no-diagrams" in args:
         extra_args.append("--no-diagrams")
@@ -152,67 +217,37 @@ def main() -> int:
     out_dir = log_dir / f"_reports_{stamp}"
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    summaries: List[RunSummary] = []
-
-    for entry in prompts:
-        pid = entry["id"]
-        ptext = entry["prompt"]
-
-        before_latest = _find_latest_run(log_dir)
-        rc, out, err = _invoke_cpp(ptext, log_dir=log_dir, extra_args=extra_args)
-        if rc != 0:
-            print(f"[FAIL] {pid}: cpp exited {rc}\nSTDOUT:\n{out}\nSTDERR:\n{err}", file=sys.stderr)
-            continue
-
-        # Determine run folder: prefer newest folder after invocation
-        after_latest = _find_latest_run(log_dir)
-        run_path = after_latest if after_latest and after_latest != before_latest else after_latest or before_latest
-        if run_path is None:
-            print(f"[FAIL] {pid}: could not locate run folder in {log_dir}", file=sys.stderr)
-            continue
-
-        run = _load_run_json(run_path)
-        ideas_count = int(run.get("ideas_count", len(run.get("items", []))) or 0)
-        generated, hidden, shown, nlp_attempted, nlp_diagrams_present = _summarize(run)
-
-        hidden_rate = (hidden / generated) if generated else 0.0
-        summaries.append(RunSummary(
-            prompt_id=pid,
-            prompt=ptext,
-            run_path=str(run_path),
-            ideas_count=ideas_count,
-            diagrams_generated=generated,
-            diagrams_hidden=hidden,
-            diagrams_shown=shown,
-            hidden_rate=hidden_rate,
-            nlp_attempted=nlp_attempted,
-            nlp_diagrams_present=nlp_diagrams_present,
-        ))
-
-        # Save per-run stdout/stderr for debugging
-        (out_dir / f"{pid}_stdout.txt").write_text(out, encoding="utf-8")
-        (out_dir / f"{pid}_stderr.txt").write_text(err, encoding="utf-8")
+    # Each cpp run is its own subprocess writing to its own log folder, so they can
+    # run side by side; map() keeps the reports in prompts.json order.
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = pool.map(lambda entry: _run_one(entry, log_dir, out_dir, stamp, extra_args), prompts)
+        summaries: List[RunSummary] = [s for s in results if s is not None]
 
     # Write CSV summary
     csv_path = out_dir / "stress_summary.csv"
     with csv_path.open("w", newline="", encoding="utf-8") as f:
         w = csv.writer(f)
         w.writerow(["prompt_id","ideas_count","diagrams_generated","diagrams_shown","diagrams_hidden","hidden_rate","nlp_attempted","nlp_diagrams_present","run_path","prompt"])
-        for s in summaries:
-            w.writerow([s.prompt_id, s.ideas_count, s.diagrams_generated, s.diagrams_shown, s.diagrams_hidden, f"{s.hidden_rate:.3f}", s.nlp_attempted, s.nlp_diagrams_present, s.run_path, s.prompt])
+        w.writerows(
+            [s.prompt_id, s.ideas_count, s.diagrams_generated, s.diagrams_shown, s.diagrams_hidden, f"{s.hidden_rate:.3f}", s.nlp_attempted, s.nlp_diagrams_present, s.run_path, s.prompt]
+            for s in summaries
+        )
 
     # Write markdown summary
     md_path = out_dir / "stress_summary.md"
-    lines = []
-    lines.append("# Stress Test Summary\n")
-    lines.append(f"- Created: {stamp}\n")
-    lines.append(f"- Log dir: `{log_dir}`\n")
-    lines.append(f"- Prompts: `{prompts_path}`\n\n")
-    lines.append("| Prompt ID | # Ideas | # Diagrams Generated | # Shown | # Hidden | Hidden Rate | NLP Attempted | NLP Diagrams | Run Path |\n")
-    lines.append("|---|---:|---:|---:|---:|---:|---:|---:|---|\n")
-    for s in summaries:
-        lines.append(f"| {s.prompt_id} | {s.ideas_count} | {s.diagrams_generated} | {s.diagrams_shown} | {s.diagrams_hidden} | {s.hidden_rate:.3f} | {s.nlp_attempted} | {s.nlp_diagrams_present} | `{s.run_path}` |\n")
-    md_path.write_text("".join(lines), encoding="utf-8")
+    header = (
+        "# Stress Test Summary\n"
+        f"- Created: {stamp}\n"
+        f"- Log dir: `{log_dir}`\n"
+        f"- Prompts: `{prompts_path}`\n\n"
+        "| Prompt ID | # Ideas | # Diagrams Generated | # Shown | # Hidden | Hidden Rate | NLP Attempted | NLP Diagrams | Run Path |\n"
+        "|---|---:|---:|---:|---:|---:|---:|---:|---|\n"
+    )
+    rows = (
+        f"| {s.prompt_id} | {s.ideas_count} | {s.diagrams_generated} | {s.diagrams_shown} | {s.diagrams_hidden} | {s.hidden_rate:.3f} | {s.nlp_attempted} | {s.nlp_diagrams_present} | `{s.run_path}` |\n"
+        for s in summaries
+    )
+    md_path.write_text(header + "".join(rows), encoding="utf-8")
 
     print(f"✅ Wrote reports to: {out_dir}")
     print(f"- {md_path}")
@@ -0,0 +1,29 @@
+"""Validator checks: 1st-hide and reuse-pass."""
+
+from cpp.diagram_validator import should_hide_diagram, validate_diagram
+
+
+def test_new_token_hides_diagram() -> None:
+    # Diagram introduces "1st" when "1st" not in idea => should hide
+    idea = "Overtones are any frequencies higher than the fundamental frequency, including harmonics."
+    diagram = [
+        "Fundamental",
+        "|",
+        "1st Harmonic (1st Overtone)",
+    ]
+    res = validate_diagram(idea, diagram)
+    assert not res.ok and "1st" in res.extra_tokens, f"expected hide: {res}"
+    assert should_hide_diagram(res), "should_hide_diagram(1st case) should be True"
+
+
+def test_reused_tokens_pass() -> None:
+    # Diagram only reuses tokens from idea => should pass
+    idea = "Harmonics and overtones relate to the fundamental frequency."
+    diagram = [
+        "Fundamental -> Harmonics",
+        "     |",
+        "  Overtones",
+    ]
+    res = validate_diagram(idea, diagram)
+    assert res.ok and len(res.extra_tokens) == 0, f"expected pass: {res}"
+    assert not should_hide_diagram(res), "should_hide_diagram(reuse case) should be False"
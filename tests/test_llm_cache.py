@@ -0,0 +1,77 @@
+"""Response cache checks: a fake upstream client behind LLMClient."""
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Iterator, List, Optional
+
+from cpp.llm import LLMClient
+
+
+class FakeCompletions:
+    """Stands in for client.chat.completions; streams fixed deltas and counts calls."""
+
+    def __init__(self, deltas: List[str]) -> None:
+        self.deltas = deltas
+        self.calls = 0
+
+    def create(self, **kwargs) -> Iterator[SimpleNamespace]:
+        self.calls += 1
+        return (
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=d))])
+            for d in self.deltas
+        )
+
+
+def _client(cache_dir: Optional[Path], deltas: List[str]) -> LLMClient:
+    llm = LLMClient(api_key="test-key", cache_dir=cache_dir)
+    llm._client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions(deltas)))
+    return llm
+
+
+def test_cache_miss_then_hit(tmp_path: Path) -> None:
+    llm = _client(tmp_path, ["Idea 1: ", "cached ", "answer\n"])
+    completions = llm._client.chat.completions
+
+    assert llm.generate_raw("system", "question") == "Idea 1: cached answer"
+    assert completions.calls == 1
+
+    # Same prompt: served from disk as one piece, no upstream call
+    assert list(llm.generate_raw_stream("system", "question")) == ["Idea 1: cached answer"]
+    assert completions.calls == 1
+
+    # Different prompt: miss
+    llm.generate_raw("system", "another question")
+    assert completions.calls == 2
+
+
+def test_partly_consumed_stream_is_not_cached(tmp_path: Path) -> None:
+    llm = _client(tmp_path, ["Idea 1: ", "partial ", "answer"])
+    completions = llm._client.chat.completions
+
+    stream = llm.generate_raw_stream("system", "question")
+    assert next(stream) == "Idea 1: "
+    stream.close()
+    assert list(tmp_path.rglob("*.txt")) == []
+
+    assert llm.generate_raw("system", "question") == "Idea 1: partial answer"
+    assert completions.calls == 2
+
+
+def test_no_cache_dir_always_calls_upstream() -> None:
+    llm = _client(None, ["answer"])
+    completions = llm._client.chat.completions
+
+    llm.generate_raw("system", "question")
+    llm.generate_raw("system", "question")
+    assert completions.calls == 2
+
+
+def test_unwritable_cache_does_not_fail_the_call(tmp_path: Path) -> None:
+    # A file where the cache directory should be: every cache write raises OSError
+    blocked = tmp_path / "cache"
+    blocked.write_text("not a directory", encoding="utf-8")
+    llm = _client(blocked, ["Idea 1: ", "answer"])
+
+    assert llm.generate_raw("system", "question") == "Idea 1: answer"
+    assert llm.generate_raw("system", "question") == "Idea 1: answer"
+    assert llm._client.chat.completions.calls == 2
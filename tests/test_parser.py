@@ -0,0 +1,102 @@
+"""Parser checks: fixed upstream responses and their expected chunks."""
+
+import random
+
+import pytest
+
+from cpp.parser import (
+    Chunk,
+    iter_ideas_stream,
+    parse_chunks,
+    parse_diagrams_batch,
+    parse_ideas_only,
+)
+
+IDEAS_RAW = (
+    "\n  Here are the ideas:\n"
+    "Idea 1: TCP is connection-oriented.\n"
+    "\n"
+    "Idea 2: UDP sends datagrams\n"
+    "without a handshake.\n"
+    "Idea 10: Both run over IP.\n"
+    "Idea 11:\n"
+)
+
+
+def test_parse_chunks_fixture() -> None:
+    raw = (
+        "Idea 1: First idea.\n"
+        "Diagram:\n"
+        "A -> B\n"
+        "  |\n"
+        "C\n"
+        "\n"
+        "Idea 2: Second idea.\n"
+        "Diagram: (none)\n"
+        "\n"
+        "Idea 3: Third idea\n"
+        "spans lines. Diagram: X -> Y\n"
+    )
+    expected = [
+        Chunk(index=1, idea_text="First idea.", diagram_lines=["A -> B", "|", "C"]),
+        Chunk(index=2, idea_text="Second idea.", diagram_lines=None),
+        Chunk(index=3, idea_text="Third idea\nspans lines.", diagram_lines=["X -> Y"]),
+    ]
+    assert parse_chunks(raw) == expected
+
+
+def test_parse_chunks_without_diagram() -> None:
+    raw = "Some preamble.\n\nIdea 1: Only text, no diagram."
+    expected = [Chunk(index=1, idea_text="Only text, no diagram.", diagram_lines=None)]
+    assert parse_chunks(raw) == expected
+
+
+def test_parse_chunks_split_idea_head_is_text() -> None:
+    # "Idea" / "8:" across a line break is not an idea marker; it stays in idea 1
+    raw = "Idea 1: TCP is reliable.\nIdea\n8: not a head"
+    expected = [
+        Chunk(index=1, idea_text="TCP is reliable.\nIdea\n8: not a head", diagram_lines=None),
+    ]
+    assert parse_chunks(raw) == expected
+    # Same segmentation in the ideas-only parsers (default mode vs --single-call)
+    assert parse_ideas_only(raw) == ["TCP is reliable.\nIdea\n8: not a head"]
+    assert list(iter_ideas_stream(raw)) == parse_ideas_only(raw)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_iter_ideas_stream_matches_parse_ideas_only(seed: int) -> None:
+    # Cut the response at random points, including inside "Idea <n>:" markers
+    rng = random.Random(seed)
+    cuts = sorted(rng.sample(range(1, len(IDEAS_RAW)), rng.randint(1, 12)))
+    deltas = [IDEAS_RAW[i:j] for i, j in zip([0] + cuts, cuts + [len(IDEAS_RAW)])]
+    assert "".join(deltas) == IDEAS_RAW
+    assert list(iter_ideas_stream(deltas)) == parse_ideas_only(IDEAS_RAW)
+
+
+def test_iter_ideas_stream_single_chars_and_empty() -> None:
+    expected = [
+        "TCP is connection-oriented.",
+        "UDP sends datagrams\nwithout a handshake.",
+        "Both run over IP.",
+    ]
+    assert parse_ideas_only(IDEAS_RAW) == expected
+    assert list(iter_ideas_stream(IDEAS_RAW)) == expected
+    assert list(iter_ideas_stream(["", "  ", "\n"])) == parse_ideas_only("  \n") == []
+
+
+def test_parse_diagrams_batch_none_missing_out_of_order() -> None:
+    raw = (
+        "Diagram 3:\n"
+        "X\n"
+        "|\n"
+        "Y\n"
+        "\n"
+        "trailing commentary\n"
+        "Diagram 1:\n"
+        "(none)\n"
+        "\n"
+        "Diagram 4:\n"
+    )
+    # Diagram 2 is missing: absent from the dict, so the proxy falls back to a per-idea call
+    expected = {3: ["X", "|", "Y"], 1: None, 4: None}
+    assert parse_diagrams_batch(raw) == expected
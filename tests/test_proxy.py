@@ -0,0 +1,97 @@
+"""Proxy checks: a fake LLM client driving ConversationProxy end to end."""
+
+import json
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import pytest
+
+from cpp.proxy import ConversationProxy
+
+
+class FakeLLM:
+    """Stands in for LLMClient: a fixed EXPLAIN stream, one diagram for every VISUALIZE call."""
+
+    model = "fake-model"
+
+    def __init__(self, explain_deltas: List[str], stream_error: Optional[Exception] = None) -> None:
+        self.explain_deltas = explain_deltas
+        self.stream_error = stream_error
+
+    def generate_raw_stream(self, system_prompt: str, user_message: str) -> Iterator[str]:
+        yield from self.explain_deltas
+        if self.stream_error is not None:
+            raise self.stream_error
+
+    def generate_raw(self, system_prompt: str, user_message: str) -> str:
+        return "Diagram:\n(none)"
+
+    def generate_raw_many(self, requests):
+        return [self.generate_raw(system_prompt, user_message) for system_prompt, user_message in requests]
+
+
+class BatchFailsLLM(FakeLLM):
+    """The batch VISUALIZE call fails; per-idea calls succeed."""
+
+    def generate_raw(self, system_prompt: str, user_message: str) -> str:
+        if "Diagram <n>:" in system_prompt:
+            raise TimeoutError("batch call timed out")
+        return super().generate_raw(system_prompt, user_message)
+
+
+def _read_run(log_dir: Path) -> dict:
+    (run_path,) = log_dir.iterdir()
+    return {
+        "run": json.loads((run_path / "run.json").read_text(encoding="utf-8")),
+        "ideas": json.loads((run_path / "ideas.json").read_text(encoding="utf-8")),
+        "explain": (run_path / "explain.txt").read_text(encoding="utf-8"),
+    }
+
+
+def test_stream_failure_after_ideas_finalizes_truncated_run(
+    tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    llm = FakeLLM(["Idea 1: First.\nIdea 2: Second.\nIdea 3: Thi"], ConnectionError("reset"))
+    proxy = ConversationProxy(llm, log_dir=tmp_path, nlp_shadow=False)
+    proxy.start_conversation("Question")
+
+    shown = [proxy.get_current_chunk()["idea"]]
+    while proxy.next():
+        shown.append(proxy.get_current_chunk()["idea"])
+    proxy.finalize_run()
+
+    assert shown == ["First.", "Second."]
+    assert capsys.readouterr().err.count("response ended early") == 1
+    logged = _read_run(tmp_path)
+    assert logged["run"]["explain_truncated"] is True
+    assert logged["run"]["ideas_count"] == 2
+    assert logged["ideas"] == ["First.", "Second."]
+    assert logged["explain"].endswith("Idea 3: Thi")
+
+
+def test_stream_failure_before_any_idea_raises(tmp_path: Path) -> None:
+    proxy = ConversationProxy(
+        FakeLLM(["Here are"], ConnectionError("reset")), log_dir=tmp_path, nlp_shadow=False
+    )
+    with pytest.raises(ConnectionError):
+        proxy.start_conversation("Question")
+
+
+def test_complete_stream_is_not_truncated(tmp_path: Path) -> None:
+    proxy = ConversationProxy(FakeLLM(["Idea 1: Only."]), log_dir=tmp_path, nlp_shadow=False)
+    proxy.start_conversation("Question")
+    proxy.finalize_run()
+    assert "explain_truncated" not in _read_run(tmp_path)["run"]
+
+
+def test_failed_batch_call_falls_back_per_idea(tmp_path: Path) -> None:
+    llm = BatchFailsLLM(["Idea 1: First.\nIdea 2: Second."])
+    proxy = ConversationProxy(llm, log_dir=tmp_path, nlp_shadow=False, batch_diagrams=True)
+    proxy.start_conversation("Question")
+    proxy.finalize_run()
+
+    items = _read_run(tmp_path)["run"]["items"]
+    assert [item["visualizer_prompt_file"] for item in items] == [
+        "prompts/visualizer_v1.md",
+        "prompts/visualizer_v1.md",
+    ]
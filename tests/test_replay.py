@@ -0,0 +1,98 @@
+"""Replay checks: save a minimal run, then load it back."""
+
+from pathlib import Path
+
+import pytest
+
+import cpp._uring_loader as uring_loader
+from cpp.run_logger import (
+    create_run_dir,
+    load_all_diagrams,
+    load_diagram,
+    load_ideas,
+    load_run_metadata,
+    save_diagram,
+    save_ideas,
+    save_run_metadata,
+)
+
+
+def test_replay_functionality(tmp_path: Path) -> None:
+    # Create a minimal run
+    run_path = create_run_dir(tmp_path / "runs", "Test question")
+
+    ideas = [
+        "First idea about testing.",
+        "Second idea about validation.",
+    ]
+    save_ideas(run_path, ideas)
+
+    save_diagram(run_path, 1, "Diagram 1\n  |\n  v")
+    save_diagram(run_path, 2, "(none)")
+
+    items = [
+        {
+            "index": 1,
+            "idea_text": ideas[0],
+            "diagram_generated": True,
+            "diagram_hidden": False,
+            "hidden_reason": None,
+            "extra_tokens": [],
+        },
+        {
+            "index": 2,
+            "idea_text": ideas[1],
+            "diagram_generated": False,
+            "diagram_hidden": False,
+            "hidden_reason": None,
+            "extra_tokens": [],
+        },
+    ]
+    save_run_metadata(
+        run_path=run_path,
+        user_prompt="Test question",
+        explainer_model="test-model",
+        visualizer_model="test-model",
+        explainer_prompt_file="prompts/explainer_v1.md",
+        visualizer_prompt_file="prompts/visualizer_v1.md",
+        diagram_policy="eager",
+        validator_enabled=True,
+        validator_max_extras=0,
+        ideas=ideas,
+        items=items,
+    )
+
+    # Load everything back; diagram 3 was never saved and must come back as None
+    metadata = load_run_metadata(run_path)
+    loaded = (
+        metadata["version"],
+        metadata["ideas_count"],
+        len(metadata["items"]),
+        load_ideas(run_path),
+        load_diagram(run_path, 1),
+        load_diagram(run_path, 2),
+        load_diagram(run_path, 3),
+    )
+    expected = (2, 2, 2, ideas, "Diagram 1\n  |\n  v", "(none)", None)
+    assert loaded == expected, f"replay mismatch: {loaded} != {expected}"
+
+
+@pytest.mark.parametrize("uring", ["unavailable", "fails"])
+def test_load_all_diagrams_plain_read_fallback(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, uring: str
+) -> None:
+    run_path = create_run_dir(tmp_path / "runs", "Test question")
+    save_diagram(run_path, 1, "A -> B")
+    save_diagram(run_path, 3, "(none)")
+
+    def broken_batch_read(paths):
+        raise OSError("io_uring_queue_init failed")
+
+    if uring == "unavailable":
+        monkeypatch.setattr(uring_loader, "is_uring_available", lambda: False)
+    else:
+        monkeypatch.setattr(uring_loader, "is_uring_available", lambda: True)
+    monkeypatch.setattr(uring_loader, "batch_read_files", broken_batch_read)
+
+    # diagram 2 was never saved; unavailable never touches batch_read_files
+    assert load_all_diagrams(run_path, 3) == ["A -> B", None, "(none)"]
@@ -0,0 +1,71 @@
+"""Run logger checks: the run.arrow sidecar and run folder naming."""
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from cpp.run_logger import create_run_dir, load_run_arrow, save_run_arrow
+
+
+def test_run_arrow_round_trip(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    items = [
+        {
+            "index": 1,
+            "idea_text": "TCP is connection-oriented.",
+            "diagram_generated": True,
+            "diagram_hidden": True,
+            "hidden_reason": "extra_tokens",
+            "extra_tokens": ["SYN", "ACK"],
+            "nlp": {"attempted": True, "diagram": "TCP -> IP", "confidence": 0.75},
+        },
+        {
+            "index": 2,
+            "idea_text": "UDP sends datagrams.",
+            "diagram_generated": False,
+            "diagram_hidden": False,
+            "hidden_reason": None,
+            "extra_tokens": [],
+            "nlp": {"attempted": False},
+        },
+    ]
+
+    assert save_run_arrow(tmp_path, items)
+    table = load_run_arrow(tmp_path)
+    expected = {
+        "index": [1, 2],
+        "idea_text": ["TCP is connection-oriented.", "UDP sends datagrams."],
+        "diagram_generated": [True, False],
+        "diagram_hidden": [True, False],
+        "hidden_reason": ["extra_tokens", None],
+        "extra_tokens": [["SYN", "ACK"], []],
+        "nlp_diagram": ["TCP -> IP", None],
+        "nlp_confidence": [0.75, None],
+    }
+    assert table.to_pydict() == expected
+
+
+def test_load_run_arrow_missing(tmp_path: Path) -> None:
+    assert load_run_arrow(tmp_path) is None
+
+
+@pytest.mark.parametrize(
+    "prompt, slug",
+    [
+        ("What is TCP vs. UDP?", "What_is_TCP_vs__UDP"),
+        ("Café naïve — résumé?!", "Café_naïve___résumé"),
+        ("日本語のテスト", "日本語のテスト"),
+        ("x\u0301y", "x_y"),  # combining accent is not alphanumeric
+        ("keep-dashes_and_underscores", "keep-dashes_and_underscores"),
+        ("  spaces  ", "spaces"),
+        ("???", "run"),
+        ("a" * 40, "a" * 30),
+    ],
+)
+def test_run_dir_slug(tmp_path: Path, prompt: str, slug: str) -> None:
+    run_path = create_run_dir(tmp_path, prompt, now=datetime(2026, 1, 2, 3, 4, 5))
+    assert run_path.name == f"2026-01-02_030405_{slug}"
+    # Same result as the per-character rule the translate table caches
+    expected = "".join(c if c.isalnum() or c in "-_" else "_" for c in prompt[:30])
+    assert slug == (expected.strip("_") or "run")